@@ -1,30 +1,74 @@
 """Main CLI entry point for streetwear inventory management"""
 
 import click
+import importlib
 import sys
 from pathlib import Path
 
-from .utils.config import create_default_config, save_config, load_config, get_config_path, validate_config_file
-from .database.connection import db
-from .database.setup import create_tables
-from .commands.add import add, add_variant
-from .commands.location import location, update_location_cmd, find_location
-from .commands.search import search, show
-from .commands.edit import edit, update_status, move
-from .commands.intake import intake, list_consigners, consigner_report
-from .commands.consign import consign, consign_sold, payout_summary, hold_item
-from .commands.photos import (
-    add_photo, list_photos, remove_photo, set_primary_photo, copy_photos,
-    photo_stats, optimize_photos, find_duplicate_photos_cmd, remove_exif_cmd, bulk_add_photos
-)
-from .commands.api import api_server, api_test, api_docs, generate_api_client
-from .commands.export import (
-    export_inventory, export_consigners, export_locations, 
-    backup_database, export_template
-)
 
+# Subcommand name -> (module, attribute). Modules are imported on first use so
+# an invocation only pays for SQLAlchemy/Pillow/Flask when its command needs them.
+LAZY_COMMANDS = {
+    'add': ('inv.commands.add', 'add'),
+    'add-variant': ('inv.commands.add', 'add_variant'),
+    'location': ('inv.commands.location', 'location'),
+    'update-location': ('inv.commands.location', 'update_location_cmd'),
+    'find-location': ('inv.commands.location', 'find_location'),
+    'search': ('inv.commands.search', 'search'),
+    'show': ('inv.commands.search', 'show'),
+    'edit': ('inv.commands.edit', 'edit'),
+    'update-status': ('inv.commands.edit', 'update_status'),
+    'move': ('inv.commands.edit', 'move'),
+    'intake': ('inv.commands.intake', 'intake'),
+    'list-consigners': ('inv.commands.intake', 'list_consigners'),
+    'consigner-report': ('inv.commands.intake', 'consigner_report'),
+    'consign': ('inv.commands.consign', 'consign'),
+    'consign-sold': ('inv.commands.consign', 'consign_sold'),
+    'payout-summary': ('inv.commands.consign', 'payout_summary'),
+    'hold-item': ('inv.commands.consign', 'hold_item'),
+    'add-photo': ('inv.commands.photos', 'add_photo'),
+    'list-photos': ('inv.commands.photos', 'list_photos'),
+    'remove-photo': ('inv.commands.photos', 'remove_photo'),
+    'set-primary-photo': ('inv.commands.photos', 'set_primary_photo'),
+    'copy-photos': ('inv.commands.photos', 'copy_photos'),
+    'photo-stats': ('inv.commands.photos', 'photo_stats'),
+    'optimize-photos': ('inv.commands.photos', 'optimize_photos'),
+    'find-duplicate-photos': ('inv.commands.photos', 'find_duplicate_photos_cmd'),
+    'remove-exif': ('inv.commands.photos', 'remove_exif_cmd'),
+    'bulk-add-photos': ('inv.commands.photos', 'bulk_add_photos'),
+    'rebuild-photo-index': ('inv.commands.photos', 'rebuild_photo_index'),
+    'api-server': ('inv.commands.api', 'api_server'),
+    'api-test': ('inv.commands.api', 'api_test'),
+    'api-docs': ('inv.commands.api', 'api_docs'),
+    'generate-api-client': ('inv.commands.api', 'generate_api_client'),
+    'export-inventory': ('inv.commands.export', 'export_inventory'),
+    'export-consigners': ('inv.commands.export', 'export_consigners'),
+    'export-locations': ('inv.commands.export', 'export_locations'),
+    'backup-database': ('inv.commands.export', 'backup_database'),
+    'export-template': ('inv.commands.export', 'export_template'),
+}
 
-@click.group()
+
+class LazyGroup(click.Group):
+    """Click group that imports subcommand modules only when they are used"""
+    
+    def __init__(self, *args, lazy_commands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = dict(lazy_commands or {})
+    
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_commands))
+    
+    def get_command(self, ctx, cmd_name):
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            module_name, attr_name = self.lazy_commands[cmd_name]
+            command = getattr(importlib.import_module(module_name), attr_name)
+            self.add_command(command, cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+
+@click.group(cls=LazyGroup, lazy_commands=LAZY_COMMANDS,
+             context_settings={'help_option_names': ['-h', '--help']})
 def cli():
     """Streetwear Inventory Management CLI"""
     pass
@@ -33,6 +77,10 @@ def cli():
 @cli.command()
 def setup():
     """Interactive setup wizard to configure the application"""
+    from .utils.config import create_default_config, save_config, get_config_path
+    from .database.connection import db
+    from .database.setup import create_tables
+    
     click.echo("🔧 Streetwear Inventory CLI Setup Wizard")
     click.echo("=" * 50)
     
@@ -152,6 +200,9 @@ def setup():
 @cli.command('test-connection')
 def test_connection():
     """Test database connection"""
+    from .utils.config import load_config
+    from .database.connection import db
+    
     try:
         config = load_config()
         db.initialize(config)
@@ -173,6 +224,9 @@ def test_connection():
 @cli.command('validate-config')
 def validate_config():
     """Validate the current configuration file"""
+    from .utils.config import load_config, get_config_path, validate_config_file
+    from .database.connection import db
+    
     try:
         config_path = get_config_path()
         
@@ -218,45 +272,6 @@ def validate_config():
         sys.exit(1)
 
 
-# Register commands
-cli.add_command(add)
-cli.add_command(add_variant)
-cli.add_command(location)
-cli.add_command(update_location_cmd)
-cli.add_command(find_location)
-cli.add_command(search)
-cli.add_command(show)
-cli.add_command(edit)
-cli.add_command(update_status)
-cli.add_command(move)
-cli.add_command(intake)
-cli.add_command(list_consigners)
-cli.add_command(consigner_report)
-cli.add_command(consign)
-cli.add_command(consign_sold)
-cli.add_command(payout_summary)
-cli.add_command(hold_item)
-cli.add_command(add_photo)
-cli.add_command(list_photos)
-cli.add_command(remove_photo)
-cli.add_command(set_primary_photo)
-cli.add_command(copy_photos)
-cli.add_command(photo_stats)
-cli.add_command(optimize_photos)
-cli.add_command(find_duplicate_photos_cmd)
-cli.add_command(remove_exif_cmd)
-cli.add_command(bulk_add_photos)
-cli.add_command(api_server)
-cli.add_command(api_test)
-cli.add_command(api_docs)
-cli.add_command(generate_api_client)
-cli.add_command(export_inventory)
-cli.add_command(export_consigners)
-cli.add_command(export_locations)
-cli.add_command(backup_database)
-cli.add_command(export_template)
-
-
 def main():
     """Main entry point for the CLI"""
     cli()
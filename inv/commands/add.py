@@ -5,15 +5,11 @@ import os
 from pathlib import Path
 from decimal import Decimal
 
-from ..database.connection import get_db_session
-from ..database.models import Item
 from ..utils.validation import (
     validate_brand_name, validate_model_name, validate_color_name,
     normalize_size, validate_size, validate_condition, validate_box_status,
     validate_price, get_validation_errors
 )
-from ..utils.sku import generate_sku
-from ..utils.locations import get_location_by_code, show_location_picker, get_default_location
 from ..utils.config import get_config
 from ..utils.database_init import with_database
 
@@ -49,6 +45,11 @@ def add(brand, model, size, color, condition, current_price, purchase_price, box
       BOX_STATUS      Box status: box, tag, both, or neither
       LOCATION        Location code (optional, will prompt if not provided)
     """
+    # Database-backed helpers are imported here so `add --help` stays light
+    from ..database.connection import get_db_session
+    from ..database.models import Item
+    from ..utils.sku import generate_sku
+    from ..utils.locations import get_location_by_code, show_location_picker, get_default_location
     
     try:
         # Validate all input parameters except size (we'll do size separately)
@@ -188,6 +189,8 @@ def add_variant(sku, interactive):
       inv add-variant NIK001
       inv add-variant NIK001 --interactive
     """
+    from ..database.connection import get_db_session
+    from ..database.models import Item
     
     try:
         # Find the base item
@@ -3,9 +3,13 @@
 import click
 import csv
 import json
+import sys
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+from sqlalchemy import func, select
 
 from ..database.connection import get_db_session
 from ..database.models import Item, Location, Consigner
@@ -19,12 +23,21 @@ try:
 except ImportError:
     PANDAS_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# --output value that streams the export to stdout instead of a file
+STDOUT = '-'
+
 
 @click.command()
 @with_database
 @click.argument('format_type', type=click.Choice(['csv', 'json', 'excel']))
-@click.option('--output', '-o', help='Output file path (auto-generated if not provided)')
-@click.option('--filter-brand', help='Filter by brand')
+@click.option('--output', '-o', help='Output file path, or - for stdout (auto-generated if not provided)')
+@click.option('--filter-brand', help='Filter by brand (exact, case-insensitive)')
 @click.option('--filter-status', help='Filter by status')
 @click.option('--filter-condition', help='Filter by condition')
 @click.option('--filter-location', help='Filter by location code')
@@ -33,9 +46,10 @@ except ImportError:
 @click.option('--include-consigner', is_flag=True, help='Include consigner details')
 @click.option('--date-from', help='Include items added after this date (YYYY-MM-DD)')
 @click.option('--date-to', help='Include items added before this date (YYYY-MM-DD)')
+@click.option('--json', 'as_json', is_flag=True, help='Print a JSON summary instead of the report')
 def export_inventory(format_type, output, filter_brand, filter_status, filter_condition, 
                     filter_location, ownership_type, include_photos, include_consigner,
-                    date_from, date_to):
+                    date_from, date_to, as_json):
     """Export inventory data to various formats
     
     Usage:
@@ -44,6 +58,8 @@ def export_inventory(format_type, output, filter_brand, filter_status, filter_co
       inv export-inventory excel --filter-brand=nike --include-photos
       inv export-inventory csv --filter-status=available --ownership-type=consignment
       inv export-inventory json --date-from=2024-01-01 --date-to=2024-12-31
+      inv export-inventory csv --output=inventory.csv --json
+      inv export-inventory json --output=- | jq '.data[].sku'
     
     Supported formats:
       csv   - Comma-separated values
@@ -56,6 +72,9 @@ def export_inventory(format_type, output, filter_brand, filter_status, filter_co
         if format_type == 'excel' and not PANDAS_AVAILABLE:
             click.echo("❌ Excel export requires pandas. Install with: pip install pandas openpyxl")
             return
+        if format_type == 'excel' and output == STDOUT:
+            click.echo("❌ Excel export needs an output file, not stdout")
+            return
         
         # Generate output filename if not provided
         if not output:
@@ -79,64 +98,40 @@ def export_inventory(format_type, output, filter_brand, filter_status, filter_co
         photo_manager = PhotoManager() if include_photos else None
         
         # Query database with filters
+        query = _item_export_select()
+        
+        # Apply filters
+        if filter_brand:
+            query = query.where(func.lower(Item.brand) == filter_brand.lower())
+        if filter_status:
+            query = query.where(Item.status == filter_status)
+        if filter_condition:
+            query = query.where(Item.condition == filter_condition)
+        if filter_location:
+            query = query.where(Location.code == filter_location.upper())
+        if ownership_type:
+            query = query.where(Item.ownership_type == ownership_type)
+        
+        # Date filters
+        if date_from:
+            from_date = datetime.strptime(date_from, '%Y-%m-%d')
+            query = query.where(Item.date_added >= from_date)
+        if date_to:
+            to_date = datetime.strptime(date_to, '%Y-%m-%d')
+            query = query.where(Item.date_added <= to_date)
+        
         with get_db_session() as session:
-            from sqlalchemy.orm import joinedload
-            
-            query = session.query(Item).options(
-                joinedload(Item.location),
-                joinedload(Item.consigner)
-            )
-            
-            # Apply filters
-            if filter_brand:
-                query = query.filter(Item.brand.ilike(f'%{filter_brand}%'))
-            if filter_status:
-                query = query.filter(Item.status == filter_status)
-            if filter_condition:
-                query = query.filter(Item.condition == filter_condition)
-            if filter_location:
-                query = query.join(Location).filter(Location.code == filter_location.upper())
-            if ownership_type:
-                query = query.filter(Item.ownership_type == ownership_type)
-            
-            # Date filters
-            if date_from:
-                from_date = datetime.strptime(date_from, '%Y-%m-%d')
-                query = query.filter(Item.date_added >= from_date)
-            if date_to:
-                to_date = datetime.strptime(date_to, '%Y-%m-%d')
-                query = query.filter(Item.date_added <= to_date)
-            
-            items = query.all()
-            
-            # Convert items to export format within session
-            export_data = []
-            for item in items:
-                item_data = _item_to_export_dict(
-                    item, 
+            export_data = [
+                _item_to_export_dict(
+                    row,
                     include_photos=include_photos,
                     include_consigner=include_consigner,
                     photo_manager=photo_manager
                 )
-                export_data.append(item_data)
-        
-        if not export_data:
-            click.echo("📭 No items found matching the specified criteria")
-            return
-        
-        # Export based on format
-        if format_type == 'csv':
-            _export_csv(export_data, output_path)
-        elif format_type == 'json':
-            _export_json(export_data, output_path)
-        elif format_type == 'excel':
-            _export_excel(export_data, output_path)
-        
-        click.echo(f"✅ Exported {len(export_data)} items to {output_path}")
-        click.echo(f"   Format: {format_type.upper()}")
-        click.echo(f"   File size: {output_path.stat().st_size:,} bytes")
+                for row in session.execute(query)
+            ]
         
-        # Show applied filters
+        # Collect applied filters for the summary
         filters_applied = []
         if filter_brand:
             filters_applied.append(f"brand={filter_brand}")
@@ -153,6 +148,42 @@ def export_inventory(format_type, output, filter_brand, filter_status, filter_co
         if date_to:
             filters_applied.append(f"to={date_to}")
         
+        if not export_data:
+            # Keep stdout clean for whatever the export was piped into
+            to_stderr = output == STDOUT
+            if as_json:
+                click.echo(json.dumps({'exported': 0, 'output': None, 'filters': filters_applied}), err=to_stderr)
+            else:
+                click.echo("📭 No items found matching the specified criteria", err=to_stderr)
+            return
+        
+        # Export based on format
+        if format_type == 'csv':
+            _export_csv(export_data, output_path)
+        elif format_type == 'json':
+            _export_json(export_data, output_path)
+        elif format_type == 'excel':
+            _export_excel(export_data, output_path)
+        
+        # The export itself is the output, so skip the report
+        if output == STDOUT:
+            return
+        
+        if as_json:
+            click.echo(json.dumps({
+                'exported': len(export_data),
+                'output': str(output_path),
+                'format': format_type,
+                'file_size': output_path.stat().st_size,
+                'filters': filters_applied
+            }))
+            return
+        
+        click.echo(f"✅ Exported {len(export_data)} items to {output_path}")
+        click.echo(f"   Format: {format_type.upper()}")
+        click.echo(f"   File size: {output_path.stat().st_size:,} bytes")
+        
+        # Show applied filters
         if filters_applied:
             click.echo(f"   Filters: {', '.join(filters_applied)}")
     
@@ -166,7 +197,7 @@ def export_inventory(format_type, output, filter_brand, filter_status, filter_co
 @click.command(name='export-consigners')
 @with_database
 @click.argument('format_type', type=click.Choice(['csv', 'json', 'excel']))
-@click.option('--output', '-o', help='Output file path')
+@click.option('--output', '-o', help='Output file path, or - for stdout')
 @click.option('--include-stats', is_flag=True, help='Include detailed statistics')
 @click.option('--include-items', is_flag=True, help='Include items for each consigner')
 def export_consigners(format_type, output, include_stats, include_items):
@@ -182,6 +213,9 @@ def export_consigners(format_type, output, include_stats, include_items):
         if format_type == 'excel' and not PANDAS_AVAILABLE:
             click.echo("❌ Excel export requires pandas. Install with: pip install pandas openpyxl")
             return
+        if format_type == 'excel' and output == STDOUT:
+            click.echo("❌ Excel export needs an output file, not stdout")
+            return
         
         if not output:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -193,7 +227,7 @@ def export_consigners(format_type, output, include_stats, include_items):
             consigners = session.query(Consigner).all()
         
         if not consigners:
-            click.echo("📭 No consigners found")
+            click.echo("📭 No consigners found", err=output == STDOUT)
             return
         
         export_data = []
@@ -246,7 +280,8 @@ def export_consigners(format_type, output, include_stats, include_items):
         elif format_type == 'excel':
             _export_excel(export_data, output_path)
         
-        click.echo(f"✅ Exported {len(consigners)} consigners to {output_path}")
+        if output != STDOUT:
+            click.echo(f"✅ Exported {len(consigners)} consigners to {output_path}")
     
     except Exception as e:
         click.echo(f"❌ Export failed: {e}")
@@ -255,7 +290,7 @@ def export_consigners(format_type, output, include_stats, include_items):
 @click.command(name='export-locations')
 @with_database
 @click.argument('format_type', type=click.Choice(['csv', 'json', 'excel']))
-@click.option('--output', '-o', help='Output file path')
+@click.option('--output', '-o', help='Output file path, or - for stdout')
 @click.option('--include-items', is_flag=True, help='Include item counts')
 def export_locations(format_type, output, include_items):
     """Export location data
@@ -270,6 +305,9 @@ def export_locations(format_type, output, include_items):
         if format_type == 'excel' and not PANDAS_AVAILABLE:
             click.echo("❌ Excel export requires pandas. Install with: pip install pandas openpyxl")
             return
+        if format_type == 'excel' and output == STDOUT:
+            click.echo("❌ Excel export needs an output file, not stdout")
+            return
         
         if not output:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -281,7 +319,7 @@ def export_locations(format_type, output, include_items):
             locations = session.query(Location).all()
         
         if not locations:
-            click.echo("📭 No locations found")
+            click.echo("📭 No locations found", err=output == STDOUT)
             return
         
         export_data = []
@@ -317,7 +355,8 @@ def export_locations(format_type, output, include_items):
         elif format_type == 'excel':
             _export_excel(export_data, output_path)
         
-        click.echo(f"✅ Exported {len(locations)} locations to {output_path}")
+        if output != STDOUT:
+            click.echo(f"✅ Exported {len(locations)} locations to {output_path}")
     
     except Exception as e:
         click.echo(f"❌ Export failed: {e}")
@@ -325,19 +364,26 @@ def export_locations(format_type, output, include_items):
 
 @click.command(name='backup-database')
 @with_database
-@click.option('--output', '-o', help='Backup file path')
+@click.option('--output', '-o', help='Backup file path, or - for stdout')
 @click.option('--compress', is_flag=True, help='Compress the backup')
 @click.option('--include-photos', is_flag=True, help='Include photos in backup')
-def backup_database(output, compress, include_photos):
+@click.option('--json', 'as_json', is_flag=True, help='Print a JSON summary instead of the report')
+def backup_database(output, compress, include_photos, as_json):
     """Create complete database backup
     
     Usage:
       inv backup-database
       inv backup-database --output=backup.json --compress
       inv backup-database --include-photos
+      inv backup-database --output=backup.json --json
+      inv backup-database --output=- > backup.json
     """
     
     try:
+        if compress and output == STDOUT:
+            click.echo("❌ Compressed backups need an output file, not stdout")
+            return
+        
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         if not output:
@@ -347,7 +393,8 @@ def backup_database(output, compress, include_photos):
         
         output_path = Path(output)
         
-        click.echo("📦 Creating database backup...")
+        if not as_json and output != STDOUT:
+            click.echo("📦 Creating database backup...")
         
         # Export all data
         backup_data = {
@@ -363,49 +410,81 @@ def backup_database(output, compress, include_photos):
         
         photo_manager = PhotoManager() if include_photos else None
         
+        # Read plain rows rather than hydrating ORM objects for every record
         with get_db_session() as session:
             # Export items
-            items = session.query(Item).all()
-            for item in items:
-                item_data = _item_to_export_dict(
-                    item, 
+            backup_data['items'] = [
+                _item_to_export_dict(
+                    row,
                     include_photos=include_photos,
                     include_consigner=True,
                     photo_manager=photo_manager
                 )
-                backup_data['items'].append(item_data)
+                for row in session.execute(_item_export_select())
+            ]
             
             # Export locations
-            locations = session.query(Location).all()
-            for location in locations:
-                backup_data['locations'].append({
+            locations = session.execute(select(
+                Location.id, Location.code, Location.location_type,
+                Location.description, Location.created_date
+            ).order_by(Location.id))
+            backup_data['locations'] = [
+                {
                     'id': location.id,
                     'code': location.code,
                     'type': location.location_type,
                     'name': location.description,
                     'created_date': location.created_date.isoformat() if location.created_date else None
-                })
+                }
+                for location in locations
+            ]
             
             # Export consigners
-            consigners = session.query(Consigner).all()
-            for consigner in consigners:
-                backup_data['consigners'].append({
+            consigners = session.execute(select(
+                Consigner.id, Consigner.name, Consigner.phone, Consigner.email,
+                Consigner.default_split_percentage, Consigner.created_date
+            ).order_by(Consigner.id))
+            backup_data['consigners'] = [
+                {
                     'id': consigner.id,
                     'name': consigner.name,
                     'phone': consigner.phone,
                     'email': consigner.email,
                     'default_split_percentage': consigner.default_split_percentage,
                     'created_date': consigner.created_date.isoformat() if consigner.created_date else None
-                })
+                }
+                for consigner in consigners
+            ]
         
         # Write backup
         if compress:
             import gzip
             with gzip.open(output_path, 'wt', encoding='utf-8') as f:
-                json.dump(backup_data, f, indent=2, default=str)
+                _dump_json(backup_data, f)
         else:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(backup_data, f, indent=2, default=str)
+            with _open_output(output_path) as f:
+                _dump_json(backup_data, f)
+        
+        if output == STDOUT:
+            return
+        
+        photo_stats = photo_manager.get_storage_stats() if include_photos else None
+        
+        if as_json:
+            summary = {
+                'output': str(output_path),
+                'items': len(backup_data['items']),
+                'locations': len(backup_data['locations']),
+                'consigners': len(backup_data['consigners']),
+                'file_size': output_path.stat().st_size,
+                'compressed': compress,
+                'photos_included': include_photos
+            }
+            if photo_stats:
+                summary['photo_files'] = photo_stats['total_files']
+                summary['photo_size_mb'] = photo_stats['total_size_mb']
+            click.echo(json.dumps(summary))
+            return
         
         # Show summary
         click.echo(f"✅ Backup completed: {output_path}")
@@ -416,8 +495,7 @@ def backup_database(output, compress, include_photos):
         click.echo(f"   Compressed: {'Yes' if compress else 'No'}")
         click.echo(f"   Photos included: {'Yes' if include_photos else 'No'}")
         
-        if include_photos:
-            photo_stats = photo_manager.get_storage_stats()
+        if photo_stats:
             click.echo(f"   Photo files: {photo_stats['total_files']}")
             click.echo(f"   Photo size: {photo_stats['total_size_mb']} MB")
     
@@ -427,7 +505,7 @@ def backup_database(output, compress, include_photos):
 
 @click.command(name='export-template')
 @click.argument('format_type', type=click.Choice(['csv', 'excel']))
-@click.option('--output', '-o', help='Template file path')
+@click.option('--output', '-o', help='Template file path, or - for stdout')
 @click.option('--include-examples', is_flag=True, help='Include example data')
 def export_template(format_type, output, include_examples):
     """Generate import template files
@@ -442,6 +520,9 @@ def export_template(format_type, output, include_examples):
         if format_type == 'excel' and not PANDAS_AVAILABLE:
             click.echo("❌ Excel templates require pandas. Install with: pip install pandas openpyxl")
             return
+        if format_type == 'excel' and output == STDOUT:
+            click.echo("❌ Excel templates need an output file, not stdout")
+            return
         
         if not output:
             output = f"import_template.{format_type}"
@@ -480,6 +561,9 @@ def export_template(format_type, output, include_examples):
         elif format_type == 'excel':
             _export_excel(template_data, output_path)
         
+        if output == STDOUT:
+            return
+        
         click.echo(f"✅ Generated import template: {output_path}")
         click.echo(f"   Format: {format_type.upper()}")
         if include_examples:
@@ -490,8 +574,27 @@ def export_template(format_type, output, include_examples):
         click.echo(f"❌ Template generation failed: {e}")
 
 
+def _item_export_select():
+    """Select the item columns exported, with location and consigner columns joined in"""
+    return select(
+        Item.sku, Item.variant_id, Item.brand, Item.model, Item.size, Item.color,
+        Item.condition, Item.box_status, Item.current_price, Item.purchase_price,
+        Item.sold_price, Item.status, Item.ownership_type, Item.notes, Item.date_added,
+        Item.sold_date, Item.split_percentage, Item.consigner_id,
+        Location.code.label('location_code'),
+        Location.description.label('location_name'),
+        Consigner.name.label('consigner_name'),
+        Consigner.phone.label('consigner_phone'),
+        Consigner.email.label('consigner_email')
+    ).select_from(Item).outerjoin(
+        Location, Item.location_id == Location.id
+    ).outerjoin(
+        Consigner, Item.consigner_id == Consigner.id
+    ).order_by(Item.id)
+
+
 def _item_to_export_dict(item, include_photos=False, include_consigner=False, photo_manager=None):
-    """Convert Item model to export dictionary"""
+    """Convert an _item_export_select() row to export dictionary"""
     data = {
         'sku': item.sku,
         'variant_id': item.variant_id,
@@ -504,8 +607,8 @@ def _item_to_export_dict(item, include_photos=False, include_consigner=False, ph
         'current_price': float(item.current_price),
         'purchase_price': float(item.purchase_price) if item.purchase_price else None,
         'sold_price': float(item.sold_price) if item.sold_price else None,
-        'location_code': item.location.code if item.location else None,
-        'location_name': item.location.description if item.location else None,
+        'location_code': item.location_code,
+        'location_name': item.location_name,
         'status': item.status,
         'ownership_type': item.ownership_type,
         'notes': item.notes,
@@ -514,11 +617,11 @@ def _item_to_export_dict(item, include_photos=False, include_consigner=False, ph
         'split_percentage': item.split_percentage
     }
     
-    if include_consigner and item.consigner:
+    if include_consigner and item.consigner_id is not None:
         data.update({
-            'consigner_name': item.consigner.name,
-            'consigner_phone': item.consigner.phone,
-            'consigner_email': item.consigner.email
+            'consigner_name': item.consigner_name,
+            'consigner_phone': item.consigner_phone,
+            'consigner_email': item.consigner_email
         })
     
     if include_photos and photo_manager:
@@ -532,12 +635,34 @@ def _item_to_export_dict(item, include_photos=False, include_consigner=False, ph
     return data
 
 
+@contextmanager
+def _open_output(output_path: Path, newline: Optional[str] = None):
+    """Open an export file for writing, or stdout when the path is '-'"""
+    if str(output_path) == STDOUT:
+        yield sys.stdout
+    else:
+        with open(output_path, 'w', newline=newline, encoding='utf-8') as f:
+            yield f
+
+
+def _dump_json(obj, f):
+    """Write obj to f as indented JSON, using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        # Pass datetimes through to str() so output matches the stdlib path
+        f.write(orjson.dumps(
+            obj, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME
+        ).decode('utf-8'))
+    else:
+        # orjson writes raw UTF-8, so don't escape non-ASCII here either
+        json.dump(obj, f, indent=2, default=str, ensure_ascii=False)
+
+
 def _export_csv(data: List[Dict], output_path: Path):
     """Export data to CSV"""
     if not data:
         return
     
-    with open(output_path, 'w', newline='', encoding='utf-8') as f:
+    with _open_output(output_path, newline='') as f:
         writer = csv.DictWriter(f, fieldnames=data[0].keys())
         writer.writeheader()
         writer.writerows(data)
@@ -551,8 +676,8 @@ def _export_json(data: List[Dict], output_path: Path):
         'data': data
     }
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(export_obj, f, indent=2, default=str)
+    with _open_output(output_path) as f:
+        _dump_json(export_obj, f)
 
 
 def _export_excel(data: List[Dict], output_path: Path):
@@ -3,16 +3,15 @@
 import click
 from pathlib import Path
 
-from ..database.connection import get_db_session
-from ..database.models import Item
 from ..utils.validation import (
     validate_brand_name, validate_model_name, validate_color_name,
     normalize_size, validate_size, validate_condition, validate_box_status,
     validate_price
 )
-from ..utils.sku import generate_sku
 from ..utils.locations import get_location_by_code, show_location_picker, get_default_location
-from ..utils.consignment import find_or_create_consigner, get_consigner_by_name, list_all_consigners
+from ..utils.consignment import (
+    find_or_create_consigner, get_consigner_by_name, list_all_consigners, create_consignment_item
+)
 from ..utils.config import get_config
 from ..utils.database_init import with_database
 
@@ -25,12 +24,22 @@ from ..utils.database_init import with_database
 @click.option('--batch', default=1, type=int, help='Number of items to intake')
 @click.option('--split', type=int, help='Override default split percentage (0-100)')
 @click.option('--interactive', '-i', is_flag=True, help='Interactive intake mode')
-def intake(consigner, phone, email, batch, split, interactive):
+@click.option('--brand', help='Item brand (skips the prompt)')
+@click.option('--model', help='Item model (skips the prompt)')
+@click.option('--size', help='Item size (skips the prompt)')
+@click.option('--color', help='Item color/colorway (skips the prompt)')
+@click.option('--condition', type=click.Choice(['DS', 'VNDS', 'Used']), help='Item condition (skips the prompt)')
+@click.option('--price', help='Asking price (skips the prompt)')
+@click.option('--box-status', type=click.Choice(['box', 'tag', 'both', 'neither']), help='Box status (skips the prompt)')
+@click.option('--notes', help='Item notes (skips the prompt)')
+def intake(consigner, phone, email, batch, split, interactive,
+           brand, model, size, color, condition, price, box_status, notes):
     """Process consignment intake for one or more items
     
     Usage:
       inv intake --consigner="John Doe" --phone="555-1234"
       inv intake --batch=3 --consigner="Mike Chen" --phone="555-5678"
+      inv intake --consigner="John Doe" --brand=nike --model="air jordan 4" --size=10.5 --color="black cat" --condition=DS --price=180 --box-status=box
       inv intake --interactive
     
     Options:
@@ -40,6 +49,8 @@ def intake(consigner, phone, email, batch, split, interactive):
       --batch         Number of items to intake (default: 1)
       --split         Custom split percentage (default: use consigner's default)
       --interactive   Interactive mode with step-by-step guidance
+      --brand, --model, --size, --color, --condition, --price, --box-status, --notes
+                      Item details; any left out are prompted for
     """
     
     try:
@@ -89,11 +100,16 @@ def intake(consigner, phone, email, batch, split, interactive):
         click.echo(f"\n📦 Processing {batch} item(s):")
         
         successful_intakes = []
+        item_details = {
+            'brand': brand, 'model': model, 'size': size, 'color': color,
+            'condition': condition, 'current_price': price, 'box_status': box_status,
+            'notes': notes
+        }
         
         for i in range(batch):
             click.echo(f"\n--- Item {i+1} of {batch} ---")
             
-            item_result = _process_single_item_intake(consigner_obj, split_percentage)
+            item_result = _process_single_item_intake(consigner_obj, split_percentage, item_details)
             if item_result:
                 successful_intakes.append(item_result)
             else:
@@ -114,20 +130,28 @@ def intake(consigner, phone, email, batch, split, interactive):
         traceback.print_exc()
 
 
-def _process_single_item_intake(consigner, split_percentage):
-    """Process intake for a single item"""
+def _process_single_item_intake(consigner, split_percentage, item_details=None):
+    """Process intake for a single item, prompting for details not given as options"""
     try:
+        item_details = item_details or {}
+        prefilled = all(item_details.get(field) for field in (
+            'brand', 'model', 'size', 'color', 'condition', 'current_price', 'box_status'
+        ))
+        
         # Get item details
-        click.echo("Enter item details:")
+        if not prefilled:
+            click.echo("Enter item details:")
         
-        brand = click.prompt("Brand")
-        model = click.prompt("Model")
-        size = click.prompt("Size")
-        color = click.prompt("Color/Colorway")
-        condition = click.prompt("Condition", type=click.Choice(['DS', 'VNDS', 'Used']))
-        current_price = click.prompt("Current asking price")
-        box_status = click.prompt("Box status", type=click.Choice(['box', 'tag', 'both', 'neither']))
-        notes = click.prompt("Notes (optional)", default="")
+        brand = item_details.get('brand') or click.prompt("Brand")
+        model = item_details.get('model') or click.prompt("Model")
+        size = item_details.get('size') or click.prompt("Size")
+        color = item_details.get('color') or click.prompt("Color/Colorway")
+        condition = item_details.get('condition') or click.prompt("Condition", type=click.Choice(['DS', 'VNDS', 'Used']))
+        current_price = item_details.get('current_price') or click.prompt("Current asking price")
+        box_status = item_details.get('box_status') or click.prompt("Box status", type=click.Choice(['box', 'tag', 'both', 'neither']))
+        notes = item_details.get('notes')
+        if notes is None:
+            notes = "" if prefilled else click.prompt("Notes (optional)", default="")
         
         # Validate inputs
         try:
@@ -154,45 +178,25 @@ def _process_single_item_intake(consigner, split_percentage):
                 click.echo("❌ Location selection required.")
                 return None
         
-        # Generate SKU
-        sku = generate_sku(brand)
-        
         # Create item record
-        with get_db_session() as session:
-            item = Item(
-                sku=sku,
-                variant_id=1,
-                brand=brand,
-                model=model,
-                size=size,
-                color=color,
-                condition=condition,
-                box_status=box_status,
-                current_price=current_price_decimal,
-                purchase_price=0,  # Consignment items have no purchase cost
-                location_id=location_obj.id,
-                notes=notes if notes else None,
-                status='available',
-                ownership_type='consignment',
-                consigner_id=consigner.id,
-                split_percentage=split_percentage
-            )
-            
-            session.add(item)
-            session.commit()
-            session.refresh(item)
-            
-            # Create photos directory
-            config = get_config()
-            photos_path = Path(config.get('photos', {}).get('storage_path', './photos'))
-            item_photos_dir = photos_path / sku
-            item_photos_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Return success info
-            details = f"{brand} {model}, Size {size}, ${current_price_decimal:.2f}"
-            click.echo(f"✅ Added consignment item {sku}: {details}")
-            
-            return (sku, details)
+        item = create_consignment_item(
+            consigner, split_percentage, location_obj.id,
+            brand=brand, model=model, size=size, color=color, condition=condition,
+            current_price=current_price_decimal, box_status=box_status, notes=notes
+        )
+        sku = item.sku
+        
+        # Create photos directory
+        config = get_config()
+        photos_path = Path(config.get('photos', {}).get('storage_path', './photos'))
+        item_photos_dir = photos_path / sku
+        item_photos_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Return success info
+        details = f"{brand} {model}, Size {size}, ${current_price_decimal:.2f}"
+        click.echo(f"✅ Added consignment item {sku}: {details}")
+        
+        return (sku, details)
     
     except Exception as e:
         click.echo(f"❌ Error processing item: {e}")
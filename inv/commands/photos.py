@@ -1,6 +1,7 @@
 """Photo management commands for inventory items"""
 
 import click
+import json
 from pathlib import Path
 from typing import List
 
@@ -67,12 +68,14 @@ def add_photo(sku, photo_path, filename, primary):
 @with_database
 @click.argument('sku')
 @click.option('--details', is_flag=True, help='Show detailed photo information')
-def list_photos(sku, details):
+@click.option('--json', 'as_json', is_flag=True, help='Print a JSON summary instead of the listing')
+def list_photos(sku, details, as_json):
     """List photos for inventory item
     
     Usage:
       inv list-photos NIK001
       inv list-photos SUP005 --details
+      inv list-photos NIK001 --json
     """
     
     try:
@@ -86,6 +89,15 @@ def list_photos(sku, details):
         manager = PhotoManager()
         photos = manager.list_photos(sku.upper())
         
+        if as_json:
+            click.echo(json.dumps({
+                'sku': sku.upper(),
+                'count': len(photos),
+                'primary': photos[0]['filename'] if photos else None,
+                'photos': [photo['filename'] for photo in photos]
+            }))
+            return
+        
         if not photos:
             click.echo(f"📷 No photos found for {sku.upper()}")
             return
@@ -236,26 +248,38 @@ def copy_photos(source_sku, dest_sku):
 @click.command(name='photo-stats')
 @with_database
 @click.option('--cleanup', is_flag=True, help='Remove orphaned photo directories')
-def photo_stats(cleanup):
+@click.option('--json', 'as_json', is_flag=True, help='Print the statistics as JSON')
+def photo_stats(cleanup, as_json):
     """Show photo storage statistics
     
     Usage:
       inv photo-stats
       inv photo-stats --cleanup
+      inv photo-stats --json
     """
     
     try:
         manager = PhotoManager()
         
+        cleanup_result = None
         if cleanup:
-            click.echo("🧹 Cleaning up orphaned photos...")
+            if not as_json:
+                click.echo("🧹 Cleaning up orphaned photos...")
             cleanup_result = manager.cleanup_orphaned_photos()
-            click.echo(f"   Removed {cleanup_result['removed_directories']} directories")
-            click.echo(f"   Removed {cleanup_result['removed_files']} files")
-            click.echo()
+            if not as_json:
+                click.echo(f"   Removed {cleanup_result['removed_directories']} directories")
+                click.echo(f"   Removed {cleanup_result['removed_files']} files")
+                click.echo(f"   Removed {cleanup_result['removed_blobs']} unused blobs")
+                click.echo()
         
         stats = manager.get_storage_stats()
         
+        if as_json:
+            if cleanup_result is not None:
+                stats['cleanup'] = cleanup_result
+            click.echo(json.dumps(stats))
+            return
+        
         click.echo("📊 Photo Storage Statistics:")
         click.echo("-" * 30)
         click.echo(f"Storage Path: {stats['storage_path']}")
@@ -318,6 +342,27 @@ def optimize_photos(sku, optimize_all):
         click.echo(f"❌ Error optimizing photos: {e}")
 
 
+@click.command(name='rebuild-photo-index')
+@with_database
+def rebuild_photo_index():
+    """Rebuild the photo index used for storage statistics
+    
+    Usage:
+      inv rebuild-photo-index
+    
+    Run this once after upgrading, or if photos were changed outside the CLI.
+    """
+    
+    try:
+        manager = PhotoManager()
+        click.echo("🔄 Rebuilding photo index...")
+        indexed_count = manager.rebuild_photo_index()
+        click.echo(f"✅ Indexed {indexed_count:,} photos")
+    
+    except Exception as e:
+        click.echo(f"❌ Error rebuilding photo index: {e}")
+
+
 @click.command(name='find-duplicate-photos')
 @with_database
 @click.option('--directory', help='Search in specific directory (default: photos storage)')
@@ -1,9 +1,10 @@
 """Search command implementation with pagination and variant grouping"""
 
 import click
+import json
 from typing import List, Dict, Optional
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, func, or_
 
 from ..database.connection import get_db_session
 from ..database.models import Item, Location
@@ -42,6 +43,123 @@ def get_price_range(items: List[Item]) -> str:
         return f"${min_price:.2f} - ${max_price:.2f}"
 
 
+def _search_query(session: Session, query: Optional[str] = None, *, brand: Optional[str] = None,
+                  model: Optional[str] = None, size: Optional[str] = None, color: Optional[str] = None,
+                  condition: Optional[str] = None, location: Optional[str] = None,
+                  status: Optional[str] = None, ownership_type: Optional[str] = None,
+                  min_price: Optional[float] = None, max_price: Optional[float] = None,
+                  sku: Optional[str] = None):
+    """Build the filtered (unordered, no eager loads) item query shared by search_items and count_items"""
+    query_obj = session.query(Item)
+    
+    # Cheap equality tests first and the LIKE scans last: SQLite generally checks
+    # the terms no index covers in the order written, stopping at the first miss
+    filters = []
+    
+    # Size filter
+    if size:
+        filters.append(Item.size == size)
+    
+    # Condition filter
+    if condition:
+        filters.append(Item.condition == condition.upper())
+    
+    # Brand filter (exact, case-insensitive, so it can use the brand index)
+    if brand:
+        filters.append(func.lower(Item.brand) == brand.lower())
+    
+    # Status and ownership filters
+    if status:
+        filters.append(Item.status == status)
+    if ownership_type:
+        filters.append(Item.ownership_type == ownership_type)
+    
+    # Price filters
+    if min_price is not None:
+        filters.append(Item.current_price >= min_price)
+    if max_price is not None:
+        filters.append(Item.current_price <= max_price)
+    
+    # SKU search
+    if sku:
+        sku_search = f"%{sku.upper()}%"
+        filters.append(Item.sku.ilike(sku_search))
+    
+    # Model filter
+    if model:
+        filters.append(Item.model.ilike(f"%{model}%"))
+    
+    # Color filter
+    if color:
+        filters.append(Item.color.ilike(f"%{color}%"))
+    
+    # Location filter
+    if location:
+        query_obj = query_obj.join(Location)
+        filters.append(Location.code.ilike(f"%{location.upper()}%"))
+    
+    # Text search across multiple fields
+    if query:
+        search_term = f"%{query.lower()}%"
+        text_filters = [
+            Item.brand.ilike(search_term),
+            Item.model.ilike(search_term),
+            Item.color.ilike(search_term),
+            Item.sku.ilike(search_term)
+        ]
+        filters.append(or_(*text_filters))
+    
+    # Apply all filters
+    if filters:
+        query_obj = query_obj.filter(and_(*filters))
+    
+    return query_obj
+
+
+def search_items(session: Session, query: Optional[str] = None, *, with_consigner: bool = True,
+                 **filters) -> List[Item]:
+    """Return items matching the search filters, ordered by SKU, with location (and consigner) loaded"""
+    options = [joinedload(Item.location)]
+    if with_consigner:
+        options.append(joinedload(Item.consigner))
+    
+    return _search_query(session, query, **filters).options(*options).order_by(Item.sku).all()
+
+
+def count_items(session: Session, query: Optional[str] = None, **filters) -> int:
+    """Count items matching the search filters with a SELECT COUNT, without loading them"""
+    return _search_query(session, query, **filters).with_entities(func.count(Item.id)).scalar()
+
+
+def item_to_dict(item: Item, detailed: bool = False) -> Dict:
+    """JSON-ready summary of an item (detailed adds the fields the detailed view shows)"""
+    data = {
+        'sku': item.sku,
+        'brand': item.brand,
+        'model': item.model,
+        'size': item.size,
+        'color': item.color,
+        'condition': item.condition,
+        'box_status': item.box_status,
+        'current_price': f"{item.current_price:.2f}",
+        'status': item.status,
+        'ownership_type': item.ownership_type,
+        'location': item.location.code if item.location else None,
+    }
+    if detailed:
+        data.update({
+            'purchase_price': f"{item.purchase_price:.2f}",
+            'consigner': item.consigner.name if item.consigner else None,
+            'split_percentage': item.split_percentage,
+            'notes': item.notes,
+            'sold_price': f"{item.sold_price:.2f}" if item.sold_price is not None else None,
+            'sold_platform': item.sold_platform,
+            'sold_date': item.sold_date.isoformat() if item.sold_date else None,
+            'date_added': item.date_added.isoformat() if item.date_added else None,
+        })
+    return data
+
+
 def display_search_results(results: List[Item], show_count_only: bool = False):
     """Display search results with pagination and variant grouping"""
     
@@ -54,14 +172,14 @@ def display_search_results(results: List[Item], show_count_only: bool = False):
         return
     
     # Group by SKU to show variants
-    grouped_results = group_by_sku(results)
+    grouped_results = list(group_by_sku(results).items())
     
     page_size = 20
     total_groups = len(grouped_results)
     
     for page_start in range(0, total_groups, page_size):
         page_end = min(page_start + page_size, total_groups)
-        page_groups = list(grouped_results.items())[page_start:page_end]
+        page_groups = grouped_results[page_start:page_end]
         
         # Display current page
         for sku, items in page_groups:
@@ -88,7 +206,7 @@ def display_search_results(results: List[Item], show_count_only: bool = False):
 @click.command()
 @with_database
 @click.argument('query', required=False)
-@click.option('--brand', help='Filter by brand')
+@click.option('--brand', help='Filter by brand (exact, case-insensitive)')
 @click.option('--model', help='Filter by model')
 @click.option('--size', help='Filter by size')
 @click.option('--color', help='Filter by color')
@@ -104,8 +222,9 @@ def display_search_results(results: List[Item], show_count_only: bool = False):
 @click.option('--count', is_flag=True, help='Show count only')
 @click.option('--sku', help='Search by SKU')
 @click.option('--detailed', is_flag=True, help='Show detailed information')
+@click.option('--json', 'as_json', is_flag=True, help='Print the results as JSON')
 def search(query, brand, model, size, color, condition, location, available, sold, held, 
-          consignment, owned, min_price, max_price, count, sku, detailed):
+          consignment, owned, min_price, max_price, count, sku, detailed, as_json):
     """Search inventory items
     
     Usage:
@@ -114,94 +233,43 @@ def search(query, brand, model, size, color, condition, location, available, sol
       inv search --brand=nike       # Filter by brand
       inv search --available        # Show only available items
       inv search --brand=nike --available --min-price=200
+      inv search --brand=nike --json | jq '.items[].sku'
     """
     
     try:
+        status = 'available' if available else 'sold' if sold else 'held' if held else None
+        ownership_type = 'consignment' if consignment else 'owned' if owned else None
+        
+        filters = dict(
+            brand=brand, model=model, size=size, color=color, condition=condition,
+            location=location, status=status, ownership_type=ownership_type,
+            min_price=min_price, max_price=max_price, sku=sku
+        )
+        
         with get_db_session() as session:
-            # Build query with joins
-            query_obj = session.query(Item).options(
-                joinedload(Item.location),
-                joinedload(Item.consigner)
-            )
-            
-            filters = []
-            
-            # Text search across multiple fields
-            if query:
-                search_term = f"%{query.lower()}%"
-                text_filters = [
-                    Item.brand.ilike(search_term),
-                    Item.model.ilike(search_term),
-                    Item.color.ilike(search_term),
-                    Item.sku.ilike(search_term)
-                ]
-                filters.append(or_(*text_filters))
-            
-            # SKU search
-            if sku:
-                sku_search = f"%{sku.upper()}%"
-                filters.append(Item.sku.ilike(sku_search))
-            
-            # Brand filter
-            if brand:
-                filters.append(Item.brand.ilike(f"%{brand}%"))
-            
-            # Model filter
-            if model:
-                filters.append(Item.model.ilike(f"%{model}%"))
-            
-            # Size filter
-            if size:
-                filters.append(Item.size == size)
-            
-            # Color filter
-            if color:
-                filters.append(Item.color.ilike(f"%{color}%"))
-            
-            # Condition filter
-            if condition:
-                filters.append(Item.condition == condition.upper())
-            
-            # Location filter
-            if location:
-                query_obj = query_obj.join(Location)
-                filters.append(Location.code.ilike(f"%{location.upper()}%"))
-            
-            # Status filters
-            if available:
-                filters.append(Item.status == 'available')
-            elif sold:
-                filters.append(Item.status == 'sold')
-            elif held:
-                filters.append(Item.status == 'held')
-            
-            # Ownership filters
-            if consignment:
-                filters.append(Item.ownership_type == 'consignment')
-            elif owned:
-                filters.append(Item.ownership_type == 'owned')
-            
-            # Price filters
-            if min_price is not None:
-                filters.append(Item.current_price >= min_price)
-            if max_price is not None:
-                filters.append(Item.current_price <= max_price)
-            
-            # Apply all filters
-            if filters:
-                query_obj = query_obj.filter(and_(*filters))
+            if count:
+                total = count_items(session, query, **filters)
+                if as_json:
+                    click.echo(json.dumps({'total': total}))
+                else:
+                    click.echo(f"Total items: {total}")
+                return
             
-            # Order by SKU
-            query_obj = query_obj.order_by(Item.sku)
+            # Only the detailed view shows consigners
+            results = search_items(session, query, with_consigner=detailed, **filters)
             
-            # Execute query
-            results = query_obj.all()
+            if as_json:
+                click.echo(json.dumps({
+                    'total': len(results),
+                    'items': [item_to_dict(item, detailed=detailed) for item in results]
+                }))
+                return
             
             # Display results
-            if detailed and not count:
+            if detailed:
                 display_detailed_results(results)
             else:
-                display_search_results(results, show_count_only=count)
+                display_search_results(results)
     
     except Exception as e:
         click.echo(f"❌ Search error: {e}")
@@ -254,14 +322,20 @@ def display_detailed_results(results: List[Item]):
 @with_database
 @click.argument('sku')
 @click.option('--edit', is_flag=True, help='Edit item details')
-def show(sku, edit):
+@click.option('--json', 'as_json', is_flag=True, help='Print the item as JSON')
+def show(sku, edit, as_json):
     """Show detailed information for a specific item
     
     Usage:
       inv show NIK001
       inv show NIK001 --edit
+      inv show NIK001 --json
     """
     
+    if edit and as_json:
+        click.echo("❌ --edit can't be combined with --json")
+        return
+    
     try:
         with get_db_session() as session:
             item = session.query(Item).options(
@@ -274,6 +348,15 @@ def show(sku, edit):
                 click.echo(f"❌ Item with SKU '{sku}' not found.")
                 return
             
+            if as_json:
+                data = item_to_dict(item, detailed=True)
+                data['photos'] = [
+                    {'file_path': photo.file_path, 'photo_type': photo.photo_type}
+                    for photo in item.photos
+                ]
+                click.echo(json.dumps(data))
+                return
+            
             # Display detailed info
             display_detailed_results([item])
             
@@ -3,16 +3,24 @@
 import os
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import StaticPool
 from sqlalchemy.exc import SQLAlchemyError
 from typing import Optional
 
 from ..utils.config import get_config
 
 
+def is_memory_database_url(database_url: str) -> bool:
+    """Check if a SQLite URL points at an in-memory database"""
+    return database_url in ('sqlite://', 'sqlite:///:memory:') or 'mode=memory' in database_url
+
+
 class DatabaseConnection:
     _instance: Optional['DatabaseConnection'] = None
     _engine = None
     _session_factory = None
+    # What the current engine was created for: (database URL, working directory)
+    _engine_key = None
     
     def __new__(cls):
         if cls._instance is None:
@@ -37,14 +45,34 @@ class DatabaseConnection:
             # Default to SQLite for any other format
             database_url = f"sqlite:///{database_url}"
         
+        # Keep the engine (its pool and compiled-statement cache) when re-initialized
+        # for the same database, e.g. by every command run in one process. Relative
+        # file URLs depend on the cwd; a private :memory: database is always fresh.
+        engine_key = (database_url, os.getcwd())
+        if self._engine is not None and self._engine_key == engine_key and \
+                database_url not in ('sqlite://', 'sqlite:///:memory:'):
+            return True
+        
+        if is_memory_database_url(database_url):
+            # Each new connection to :memory: is an empty database, so every
+            # session must share one connection (recycling it would drop the data,
+            # pinging it is wasted work since it cannot go away)
+            engine_options = {
+                'poolclass': StaticPool,
+                'connect_args': {'check_same_thread': False},
+            }
+        else:
+            # LIFO checkout keeps reusing the warmest connection and lets idle ones time out
+            engine_options = {'pool_pre_ping': True, 'pool_recycle': 300, 'pool_use_lifo': True}
+        
         try:
             self._engine = create_engine(
                 database_url,
-                pool_pre_ping=True,
-                pool_recycle=300,
-                echo=False  # Set to True for SQL debugging
+                echo=False,  # Set to True for SQL debugging
+                **engine_options
             )
             self._session_factory = sessionmaker(bind=self._engine)
+            self._engine_key = engine_key
             return True
         except SQLAlchemyError as e:
             raise ConnectionError(f"Failed to connect to database: {e}")
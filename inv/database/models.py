@@ -1,6 +1,6 @@
 """SQLAlchemy models for streetwear inventory"""
 
-from sqlalchemy import Column, Integer, String, Boolean, Text, TIMESTAMP, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, Text, TIMESTAMP, ForeignKey, Float, Index
 from sqlalchemy.types import DECIMAL
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import relationship
@@ -41,7 +41,7 @@ class Item(Base):
     __tablename__ = 'items'
     
     id = Column(Integer, primary_key=True)
-    sku = Column(String(10), nullable=False)
+    sku = Column(String(10), nullable=False, index=True)
     variant_id = Column(Integer, default=1)
     brand = Column(String(100), nullable=False)
     model = Column(String(200), nullable=False)
@@ -72,6 +72,8 @@ class Item(Base):
     photos = relationship("Photo", back_populates="item", cascade="all, delete-orphan")
     
     __table_args__ = (
+        # Case-insensitive brand lookups; search's size/condition/price filters use the rest
+        Index('ix_items_brand_size_condition_price', func.lower(brand), size, condition, current_price),
         {'sqlite_autoincrement': True}
     )
 
@@ -87,4 +89,14 @@ class Photo(Base):
     created_date = Column(TIMESTAMP, default=func.current_timestamp())
     
     # Relationships
-    item = relationship("Item", back_populates="photos")
\ No newline at end of file
+    item = relationship("Item", back_populates="photos")
+
+
+class PhotoIndex(Base):
+    __tablename__ = 'photo_index'
+    
+    sku = Column(String(10), primary_key=True)
+    filename = Column(String(255), primary_key=True)
+    size_bytes = Column(Integer, nullable=False)
+    mtime = Column(Float)
+    inode_key = Column(String(50))  # "dev:ino", hardlinked blobs share one key
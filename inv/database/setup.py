@@ -2,6 +2,7 @@
 
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.schema import CreateIndex
 
 from .models import Base
 from .connection import db
@@ -12,29 +13,41 @@ def create_tables():
     try:
         engine = db.get_engine()
         
-        # Create all tables defined in models
-        Base.metadata.create_all(engine)
+        # Create all tables defined in models (existing tables are skipped)
+        Base.metadata.create_all(engine, checkfirst=True)
         
-        # Add CHECK constraints via raw SQL (skip for SQLite in testing)
+        # create_all skips existing tables along with their indexes, so indexes
+        # added to the models later are created here for older databases.
+        # IF NOT EXISTS rather than checkfirst: SQLite reflection does not see
+        # expression indexes such as lower(brand)
+        with engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    conn.execute(CreateIndex(index, if_not_exists=True))
+        
+        # SQLite handles constraints differently than other databases, so there
+        # is nothing more to do (and no need to open a connection) for it
+        if str(engine.url).startswith('sqlite'):
+            return True
+        
+        # Add CHECK constraints via raw SQL
         with engine.connect() as conn:
-            # SQLite handles constraints differently than other databases
-            if not str(engine.url).startswith('sqlite'):
-                constraints = [
-                    "ALTER TABLE items ADD CONSTRAINT check_condition CHECK (condition IN ('DS', 'VNDS', 'Used'))",
-                    "ALTER TABLE items ADD CONSTRAINT check_box_status CHECK (box_status IN ('box', 'tag', 'both', 'neither'))",
-                    "ALTER TABLE items ADD CONSTRAINT check_status CHECK (status IN ('available', 'sold', 'held', 'deleted'))",
-                    "ALTER TABLE items ADD CONSTRAINT check_ownership_type CHECK (ownership_type IN ('owned', 'consignment'))",
-                    "ALTER TABLE items ADD CONSTRAINT unique_sku_variant UNIQUE (sku, variant_id)"
-                ]
-                
-                for constraint in constraints:
-                    try:
-                        conn.execute(text(constraint))
-                    except SQLAlchemyError:
-                        # Constraint might already exist, continue
-                        pass
-                
-                conn.commit()
+            constraints = [
+                "ALTER TABLE items ADD CONSTRAINT check_condition CHECK (condition IN ('DS', 'VNDS', 'Used'))",
+                "ALTER TABLE items ADD CONSTRAINT check_box_status CHECK (box_status IN ('box', 'tag', 'both', 'neither'))",
+                "ALTER TABLE items ADD CONSTRAINT check_status CHECK (status IN ('available', 'sold', 'held', 'deleted'))",
+                "ALTER TABLE items ADD CONSTRAINT check_ownership_type CHECK (ownership_type IN ('owned', 'consignment'))",
+                "ALTER TABLE items ADD CONSTRAINT unique_sku_variant UNIQUE (sku, variant_id)"
+            ]
+            
+            for constraint in constraints:
+                try:
+                    conn.execute(text(constraint))
+                except SQLAlchemyError:
+                    # Constraint might already exist, continue
+                    pass
+            
+            conn.commit()
         
         return True
         
@@ -1,52 +1,177 @@
 """Configuration management for YAML config files"""
 
 import os
+import json
 import yaml
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
 
 
 CONFIG_FILE = "config.yaml"
-_cached_config: Optional[Dict[str, Any]] = None
+# Environment variable naming a config file to use instead of config.yaml in the cwd
+CONFIG_PATH_ENV = "INV_CONFIG_PATH"
+
+# Prefer the libyaml C bindings when PyYAML was built with them
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# JSON sidecar written next to the YAML so cold starts can skip YAML parsing;
+# bump the version whenever the cached structure changes
+CONFIG_CACHE_SUFFIX = ".cache.json"
+CONFIG_CACHE_VERSION = 1
+
+# Last brand prefix lookup built: (brand_prefixes contents, lookup, used prefixes)
+_brand_prefix_index: Optional[Tuple[FrozenSet[Tuple[str, str]], Dict[str, str], FrozenSet[str]]] = None
 
 
 def get_config_path() -> Path:
-    """Get the path to the config file"""
+    """Get the path to the config file ($INV_CONFIG_PATH, else config.yaml in the cwd)"""
+    env_path = os.environ.get(CONFIG_PATH_ENV)
+    if env_path:
+        return Path(env_path)
     return Path.cwd() / CONFIG_FILE
 
 
-def load_config(force_reload: bool = False) -> Dict[str, Any]:
-    """Load configuration from YAML file"""
-    global _cached_config
+def get_config_cache_path(config_path: Path) -> Path:
+    """Get the path to the JSON sidecar cache for a config file"""
+    return config_path.with_name(config_path.name + CONFIG_CACHE_SUFFIX)
+
+
+def _read_config_cache(config_path: Path, stat: os.stat_result) -> Optional[Dict[str, Any]]:
+    """Return config from the JSON sidecar if it matches the YAML file on disk"""
+    try:
+        with open(get_config_cache_path(config_path), 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
     
-    if _cached_config is not None and not force_reload:
-        return _cached_config
+    if (cache.get('version') != CONFIG_CACHE_VERSION or
+            cache.get('mtime_ns') != stat.st_mtime_ns or
+            cache.get('size') != stat.st_size):
+        return None
     
-    config_path = get_config_path()
+    return cache.get('config')
+
+
+def _write_config_cache(config_path: Path, stat: os.stat_result, config: Dict[str, Any]) -> None:
+    """Atomically write the JSON sidecar (skipped if config isn't JSON round-trippable)"""
+    try:
+        if json.loads(json.dumps(config)) != config:
+            return
+    except (TypeError, ValueError):
+        return
     
-    if not config_path.exists():
-        raise FileNotFoundError(f"Configuration file not found: {config_path}")
+    cache_path = get_config_cache_path(config_path)
+    temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    cache = {
+        'version': CONFIG_CACHE_VERSION,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'config': config
+    }
     
     try:
-        with open(config_path, 'r') as f:
-            _cached_config = yaml.safe_load(f)
-        return _cached_config
+        with open(temp_path, 'w') as f:
+            json.dump(cache, f)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        # Cache is optional, e.g. read-only config directory
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+
+
+def _parse_config(text: str) -> Dict[str, Any]:
+    """Parse config YAML text, raising ValueError if it is malformed"""
+    try:
+        return yaml.load(text, Loader=YAML_LOADER)
     except yaml.YAMLError as e:
         raise ValueError(f"Invalid YAML configuration: {e}")
 
 
-def save_config(config: Dict[str, Any]) -> None:
-    """Save configuration to YAML file"""
-    global _cached_config
+def _dump_config(config: Dict[str, Any]) -> str:
+    """Serialize config to YAML text"""
+    return yaml.dump(config, Dumper=YAML_DUMPER, default_flow_style=False, indent=2)
+
+
+class ConfigLoader:
+    """Load and save config files, caching parsed configs on the instance"""
     
-    config_path = get_config_path()
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path is not None else None
+        self.current: Optional[Dict[str, Any]] = None
+        # Parsed configs keyed by path, with the (mtime_ns, size) they were parsed at
+        self._cache: Dict[Path, Tuple[int, int, Dict[str, Any]]] = {}
     
-    try:
-        with open(config_path, 'w') as f:
-            yaml.dump(config, f, default_flow_style=False, indent=2)
-        _cached_config = config
-    except Exception as e:
-        raise Exception(f"Failed to save configuration: {e}")
+    def get_path(self) -> Path:
+        """Get the config path for this loader (get_config_path() by default)"""
+        return self.path if self.path is not None else get_config_path()
+    
+    def load(self, force_reload: bool = False, path: Optional[Path] = None) -> Dict[str, Any]:
+        """Load configuration from YAML file (re-parsed only when the file changes)"""
+        config_path = Path(path) if path is not None else self.get_path()
+        
+        try:
+            stat = os.stat(config_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Configuration file not found: {config_path}")
+        
+        if not force_reload:
+            cached = self._cache.get(config_path)
+            if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                self.current = cached[2]
+                return self.current
+            
+            config = _read_config_cache(config_path, stat)
+            if config is not None:
+                self.current = config
+                self._cache[config_path] = (stat.st_mtime_ns, stat.st_size, config)
+                return config
+        
+        with open(config_path, 'r') as f:
+            config = _parse_config(f.read())
+        
+        self.current = config
+        self._cache[config_path] = (stat.st_mtime_ns, stat.st_size, config)
+        _write_config_cache(config_path, stat, config)
+        return config
+    
+    def save(self, config: Dict[str, Any], path: Optional[Path] = None) -> None:
+        """Save configuration to YAML file"""
+        global _brand_prefix_index
+        
+        config_path = Path(path) if path is not None else self.get_path()
+        
+        try:
+            with open(config_path, 'w') as f:
+                f.write(_dump_config(config))
+            stat = os.stat(config_path)
+            self._cache[config_path] = (stat.st_mtime_ns, stat.st_size, config)
+            self.current = config
+            _brand_prefix_index = None
+        except Exception as e:
+            raise Exception(f"Failed to save configuration: {e}")
+        
+        # Invalidate the JSON sidecar, the next cold load rebuilds it
+        try:
+            os.unlink(get_config_cache_path(config_path))
+        except OSError:
+            pass
+
+
+# Loader behind the module-level helpers, follows $INV_CONFIG_PATH or the current working directory
+_default_loader = ConfigLoader()
+
+
+def load_config(force_reload: bool = False, path: Optional[Path] = None) -> Dict[str, Any]:
+    """Load configuration from YAML file (re-parsed only when the file changes)"""
+    return _default_loader.load(force_reload=force_reload, path=path)
+
+
+def save_config(config: Dict[str, Any], path: Optional[Path] = None) -> None:
+    """Save configuration to YAML file"""
+    _default_loader.save(config, path=path)
 
 
 def get_config() -> Dict[str, Any]:
@@ -54,11 +179,30 @@ def get_config() -> Dict[str, Any]:
     return load_config()
 
 
+def get_brand_prefix_index(config: Dict[str, Any]) -> Tuple[Dict[str, str], FrozenSet[str]]:
+    """Get lowercase brand -> uppercase prefix lookup and the set of prefixes in use"""
+    global _brand_prefix_index
+    
+    brand_prefixes = config.get('brand_prefixes') or {}
+    
+    # Keyed on contents rather than identity: callers may edit the loaded
+    # mapping in place without saving it
+    fingerprint = frozenset(brand_prefixes.items())
+    cached = _brand_prefix_index
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1], cached[2]
+    
+    lookup = {str(brand).lower().strip(): str(prefix).upper() for brand, prefix in brand_prefixes.items()}
+    used_prefixes = frozenset(lookup.values())
+    _brand_prefix_index = (fingerprint, lookup, used_prefixes)
+    return lookup, used_prefixes
+
+
 def get_current_config() -> Dict[str, Any]:
     """Get current cached configuration without reloading"""
-    if _cached_config is None:
+    if _default_loader.current is None:
         return load_config()
-    return _cached_config
+    return _default_loader.current
 
 
 def validate_config_structure(config: Dict[str, Any]) -> List[str]:
@@ -127,7 +271,8 @@ def validate_config_file() -> List[str]:
 
 
 def create_default_config() -> Dict[str, Any]:
-    """Create default configuration structure"""
+    """Create default configuration structure (a fresh, mutable dict per call)"""
+    # Built from a literal on purpose: this is cheaper than deep-copying a cached template
     return {
         'database': {
             'url': 'sqlite:///streetwear_inventory.db'
@@ -8,6 +8,7 @@ from ..database.connection import get_db_session
 from ..database.models import Consigner, Item
 from ..utils.validation import validate_phone, validate_email, validate_percentage
 from ..utils.pricing import calculate_consignment_payout
+from ..utils.sku import generate_sku
 
 
 def get_consigner_by_phone(phone: str) -> Optional[Consigner]:
@@ -45,7 +46,7 @@ def find_or_create_consigner(name: str, phone: str = None, email: str = None,
         if phone:
             # Multiple name matches but we have phone to disambiguate
             for match in name_matches:
-                if match.phone == validate_phone(phone):
+                if match.phone == normalized_phone:
                     return match
         else:
             # Multiple matches, need disambiguation
@@ -55,8 +56,7 @@ def find_or_create_consigner(name: str, phone: str = None, email: str = None,
     if not phone:
         raise ValueError("Phone number required to create new consigner")
     
-    # Validate inputs
-    normalized_phone = validate_phone(phone)
+    # Validate inputs (phone was already normalized above)
     if email and not validate_email(email):
         raise ValueError("Invalid email address")
     if not validate_percentage(default_split):
@@ -77,6 +77,37 @@ def find_or_create_consigner(name: str, phone: str = None, email: str = None,
         return consigner
 
 
+def create_consignment_item(consigner: Consigner, split_percentage: int, location_id: int, *,
+                            brand: str, model: str, size: str, color: str, condition: str,
+                            current_price: Decimal, box_status: str, notes: str = None) -> Item:
+    """Create a consignment item from already-validated details, generating its SKU"""
+    with get_db_session() as session:
+        item = Item(
+            sku=generate_sku(brand),
+            variant_id=1,
+            brand=brand,
+            model=model,
+            size=size,
+            color=color,
+            condition=condition,
+            box_status=box_status,
+            current_price=current_price,
+            purchase_price=0,  # Consignment items have no purchase cost
+            location_id=location_id,
+            notes=notes if notes else None,
+            status='available',
+            ownership_type='consignment',
+            consigner_id=consigner.id,
+            split_percentage=split_percentage
+        )
+        
+        session.add(item)
+        session.commit()
+        session.refresh(item)
+        
+        return item
+
+
 def get_consigner_items(consigner_id: int, status: str = None) -> List[Item]:
     """Get all items for a consigner"""
     with get_db_session() as session:
@@ -2,7 +2,6 @@
 
 import functools
 import click
-from ..database.connection import db
 from .config import get_config
 
 
@@ -10,6 +9,9 @@ def with_database(func):
     """Decorator to ensure database is initialized before command execution"""
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
+        # Imported on call so decorated commands can show --help without SQLAlchemy
+        from ..database.connection import db
+        
         try:
             # Initialize database connection
             config = get_config()
@@ -1,5 +1,6 @@
 """Location management utilities"""
 
+import re
 import click
 from typing import List, Optional
 from sqlalchemy.orm import Session
@@ -9,6 +10,10 @@ from ..database.models import Location
 from .config import get_config
 
 
+# 1-50 letters, numbers, hyphens or underscores
+_LOCATION_CODE_RE = re.compile(r'[a-zA-Z0-9_-]{1,50}')
+
+
 def get_all_active_locations() -> List[Location]:
     """Get all active locations from database"""
     with get_db_session() as session:
@@ -194,22 +199,7 @@ def validate_location_code(code: str) -> bool:
     if not code:
         return False
     
-    code = code.strip()
-    
-    # Must not be empty
-    if len(code) == 0:
-        return False
-    
-    # Must not be too long
-    if len(code) > 50:
-        return False
-    
-    # Must contain only valid characters (letters, numbers, hyphens, underscores)
-    import re
-    if not re.match(r'^[a-zA-Z0-9_-]+$', code):
-        return False
-    
-    return True
+    return _LOCATION_CODE_RE.fullmatch(code.strip()) is not None
 
 
 def suggest_location_code(location_type: str, description: str = None) -> str:
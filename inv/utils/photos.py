@@ -2,14 +2,31 @@
 
 import os
 import shutil
+import subprocess
 from pathlib import Path
 from typing import List, Optional, Dict, Any
-from PIL import Image
 import hashlib
 from datetime import datetime
 
 from ..utils.config import get_config
 
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    Image = None
+    PIL_AVAILABLE = False
+
+
+# Content-addressable blob store inside the photos storage path
+BLOBS_DIR = "blobs"
+
+
+def _require_pil():
+    """Raise a helpful error when Pillow is not installed"""
+    if not PIL_AVAILABLE:
+        raise RuntimeError("Photo processing requires Pillow. Install with: pip install streetwear-inventory-cli[photos]")
+
 
 class PhotoManager:
     """Manages photo operations for inventory items"""
@@ -18,6 +35,10 @@ class PhotoManager:
         config = get_config()
         self.storage_path = Path(config.get('photos', {}).get('storage_path', './photos'))
         self.storage_path.mkdir(parents=True, exist_ok=True)
+        self.blobs_path = self.storage_path / BLOBS_DIR
+        
+        # Item directories this manager already created, so repeat adds skip mkdir
+        self._created_dirs = set()
         
         # Supported image formats
         self.supported_formats = {'.jpg', '.jpeg', '.png', '.webp', '.bmp', '.tiff'}
@@ -26,6 +47,9 @@ class PhotoManager:
         self.max_width = 1920
         self.max_height = 1920
         self.jpeg_quality = 85
+        
+        # Optional libjpeg-turbo/mozjpeg tool for lossless JPEG recompression
+        self.jpegtran_path = shutil.which('jpegtran')
     
     def get_item_photos_dir(self, sku: str) -> Path:
         """Get photos directory for specific item"""
@@ -34,9 +58,39 @@ class PhotoManager:
     def create_item_photos_dir(self, sku: str) -> Path:
         """Create photos directory for item if it doesn't exist"""
         photos_dir = self.get_item_photos_dir(sku)
-        photos_dir.mkdir(parents=True, exist_ok=True)
+        if photos_dir not in self._created_dirs:
+            photos_dir.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(photos_dir)
         return photos_dir
     
+    def iter_item_dirs(self):
+        """Yield per-item photo directories (skips the blob store)"""
+        for item_dir in self.storage_path.iterdir():
+            if item_dir.is_dir() and item_dir.name != BLOBS_DIR:
+                yield item_dir
+    
+    def get_blob_path(self, content_hash: str) -> Path:
+        """Get blob path for a content hash (sharded by first two hex digits)"""
+        return self.blobs_path / content_hash[:2] / content_hash[2:]
+    
+    def store_blob(self, photo_path: Path) -> Path:
+        """Hardlink a stored photo to its content blob, reusing an existing blob if present"""
+        blob_path = self.get_blob_path(get_file_digest(str(photo_path)))
+        
+        try:
+            if blob_path.exists():
+                if not os.path.samefile(blob_path, photo_path):
+                    temp_path = photo_path.with_name(f".{photo_path.name}.link")
+                    os.link(blob_path, temp_path)
+                    os.replace(temp_path, photo_path)
+            else:
+                blob_path.parent.mkdir(parents=True, exist_ok=True)
+                os.link(photo_path, blob_path)
+        except OSError:
+            pass  # No hardlink support, keep the standalone copy
+        
+        return blob_path
+    
     def add_photo(self, sku: str, source_path: str, filename: Optional[str] = None) -> Dict[str, Any]:
         """Add photo to item, removing EXIF and optimizing"""
         source_path = Path(source_path)
@@ -47,6 +101,8 @@ class PhotoManager:
         if source_path.suffix.lower() not in self.supported_formats:
             raise ValueError(f"Unsupported image format: {source_path.suffix}")
         
+        _require_pil()
+        
         # Create item photos directory
         photos_dir = self.create_item_photos_dir(sku)
         
@@ -80,7 +136,18 @@ class PhotoManager:
                     save_kwargs['quality'] = self.jpeg_quality
                     save_kwargs['format'] = 'JPEG'
                 
-                img.save(dest_path, **save_kwargs)
+                # dest_path may be hardlinked to a blob and to other items' photos;
+                # writing a new file and renaming it over dest leaves those intact
+                temp_path = dest_path.with_name(f".{dest_path.stem}.tmp{dest_path.suffix}")
+                try:
+                    img.save(temp_path, **save_kwargs)
+                    os.replace(temp_path, dest_path)
+                finally:
+                    temp_path.unlink(missing_ok=True)
+            
+            # Share identical bytes with existing photos
+            self.store_blob(dest_path)
+            self.sync_photo_index(sku)
             
             # Get file info
             file_info = self._get_photo_info(dest_path)
@@ -104,6 +171,7 @@ class PhotoManager:
         
         if photo_path.exists():
             photo_path.unlink()
+            self.sync_photo_index(sku)
             return True
         return False
     
@@ -148,6 +216,7 @@ class PhotoManager:
             new_path.rename(backup_path)
         
         photo_path.rename(new_path)
+        self.sync_photo_index(sku)
         return True
     
     def copy_photos_to_item(self, source_sku: str, dest_sku: str) -> int:
@@ -162,9 +231,25 @@ class PhotoManager:
         for photo_path in source_dir.iterdir():
             if photo_path.is_file() and photo_path.suffix.lower() in self.supported_formats:
                 dest_path = dest_dir / photo_path.name
-                shutil.copy2(photo_path, dest_path)
+                if dest_path.exists():
+                    source_stat = photo_path.stat()
+                    dest_stat = dest_path.stat()
+                    # Already linked or an identical copy, nothing to do
+                    if (os.path.samestat(source_stat, dest_stat) or
+                            (source_stat.st_size == dest_stat.st_size and
+                             source_stat.st_mtime == dest_stat.st_mtime)):
+                        copied_count += 1
+                        continue
+                    dest_path.unlink()
+                try:
+                    # Variants share the same blob, no bytes are copied
+                    os.link(photo_path, dest_path)
+                except OSError:
+                    # copyfile uses in-kernel copies (sendfile/copy_file_range) where available
+                    shutil.copyfile(photo_path, dest_path)
                 copied_count += 1
         
+        self.sync_photo_index(dest_sku)
         return copied_count
     
     def cleanup_orphaned_photos(self) -> Dict[str, int]:
@@ -178,33 +263,140 @@ class PhotoManager:
         
         removed_dirs = 0
         removed_files = 0
+        removed_blobs = 0
         
-        for item_dir in self.storage_path.iterdir():
-            if item_dir.is_dir() and item_dir.name not in existing_skus:
+        for item_dir in list(self.iter_item_dirs()):
+            if item_dir.name not in existing_skus:
                 # Remove orphaned directory
                 file_count = len([f for f in item_dir.iterdir() if f.is_file()])
                 shutil.rmtree(item_dir)
+                self._created_dirs.discard(item_dir)
+                self.sync_photo_index(item_dir.name)
                 removed_dirs += 1
                 removed_files += file_count
         
+        # Drop blobs no longer linked from any item directory
+        if self.blobs_path.exists():
+            for root, _, files in os.walk(self.blobs_path):
+                for name in files:
+                    blob_path = os.path.join(root, name)
+                    if os.stat(blob_path).st_nlink == 1:
+                        os.unlink(blob_path)
+                        removed_blobs += 1
+        
         return {
             'removed_directories': removed_dirs,
-            'removed_files': removed_files
+            'removed_files': removed_files,
+            'removed_blobs': removed_blobs
         }
     
+    def sync_photo_index(self, sku: str) -> bool:
+        """Refresh photo index rows for one item from its photos directory"""
+        from sqlalchemy.exc import SQLAlchemyError
+        from ..database.connection import get_db_session
+        from ..database.models import PhotoIndex
+        
+        photos_dir = self.get_item_photos_dir(sku)
+        entries = []
+        if photos_dir.exists():
+            for photo_path in photos_dir.iterdir():
+                if photo_path.is_file() and photo_path.suffix.lower() in self.supported_formats:
+                    stat = photo_path.stat()
+                    entries.append(PhotoIndex(
+                        sku=photos_dir.name,
+                        filename=photo_path.name,
+                        size_bytes=stat.st_size,
+                        mtime=stat.st_mtime,
+                        inode_key=f"{stat.st_dev}:{stat.st_ino}"
+                    ))
+        
+        try:
+            with get_db_session() as session:
+                session.query(PhotoIndex).filter(PhotoIndex.sku == photos_dir.name).delete()
+                session.add_all(entries)
+                session.commit()
+            return True
+        except (RuntimeError, SQLAlchemyError):
+            # Index is an optimization only; stats fall back to a directory walk
+            return False
+    
+    def rebuild_photo_index(self) -> int:
+        """Rebuild the photo index from the storage tree, returning files indexed"""
+        from ..database.connection import get_db_session, db
+        from ..database.models import PhotoIndex
+        
+        PhotoIndex.__table__.create(db.get_engine(), checkfirst=True)
+        
+        with get_db_session() as session:
+            session.query(PhotoIndex).delete()
+            session.commit()
+        
+        for item_dir in self.iter_item_dirs():
+            self.sync_photo_index(item_dir.name)
+        
+        with get_db_session() as session:
+            return session.query(PhotoIndex).count()
+    
+    def _get_indexed_stats(self) -> Optional[Dict[str, int]]:
+        """Get file totals from the photo index, or None if it is unavailable"""
+        from sqlalchemy import func
+        from sqlalchemy.exc import SQLAlchemyError
+        from ..database.connection import get_db_session
+        from ..database.models import PhotoIndex
+        
+        try:
+            with get_db_session() as session:
+                indexed_skus = {sku for (sku,) in session.query(PhotoIndex.sku).distinct()}
+            
+            # Directories with no rows (photos stored before the index existed,
+            # or added outside the CLI) are indexed on first use, so an index
+            # that only knows about recent photos never undercounts
+            for item_dir in self.iter_item_dirs():
+                if item_dir.name not in indexed_skus and not self.sync_photo_index(item_dir.name):
+                    return None
+            
+            with get_db_session() as session:
+                total_files = session.query(func.count()).select_from(PhotoIndex).scalar()
+                
+                # Hardlinked photos only occupy disk space once
+                unique_files = session.query(
+                    PhotoIndex.inode_key, PhotoIndex.size_bytes
+                ).distinct().subquery()
+                total_size = session.query(func.sum(unique_files.c.size_bytes)).scalar()
+        except (RuntimeError, SQLAlchemyError):
+            return None
+        
+        return {'total_files': total_files, 'total_size': total_size or 0}
+    
     def get_storage_stats(self) -> Dict[str, Any]:
         """Get photo storage statistics"""
+        indexed = self._get_indexed_stats()
+        if indexed is not None:
+            total_size = indexed['total_size']
+            return {
+                'total_files': indexed['total_files'],
+                'total_size_bytes': total_size,
+                'total_size_mb': round(total_size / 1024 / 1024, 2),
+                'directories': sum(1 for _ in self.iter_item_dirs()),
+                'storage_path': str(self.storage_path)
+            }
+        
         total_files = 0
         total_size = 0
         directories = 0
+        seen_inodes = set()
         
-        for item_dir in self.storage_path.iterdir():
-            if item_dir.is_dir():
-                directories += 1
-                for photo_path in item_dir.iterdir():
-                    if photo_path.is_file():
-                        total_files += 1
-                        total_size += photo_path.stat().st_size
+        for item_dir in self.iter_item_dirs():
+            directories += 1
+            for photo_path in item_dir.iterdir():
+                # Same rule as the photo index, so stats don't depend on which path ran
+                if photo_path.is_file() and photo_path.suffix.lower() in self.supported_formats:
+                    total_files += 1
+                    stat = photo_path.stat()
+                    # Hardlinked photos only occupy disk space once
+                    if (stat.st_dev, stat.st_ino) not in seen_inodes:
+                        seen_inodes.add((stat.st_dev, stat.st_ino))
+                        total_size += stat.st_size
         
         return {
             'total_files': total_files,
@@ -220,9 +412,11 @@ class PhotoManager:
             stat = photo_path.stat()
             
             # Get image dimensions and format
-            with Image.open(photo_path) as img:
-                dimensions = f"{img.width}x{img.height}"
-                format_name = img.format
+            dimensions = format_name = None
+            if PIL_AVAILABLE:
+                with Image.open(photo_path) as img:
+                    dimensions = f"{img.width}x{img.height}"
+                    format_name = img.format
             
             return {
                 'filename': photo_path.name,
@@ -241,8 +435,27 @@ class PhotoManager:
                 'error': str(e)
             }
     
+    def _optimize_jpeg_lossless(self, photo_path: Path, temp_path: Path) -> bool:
+        """Rebuild JPEG Huffman tables with jpegtran (strips EXIF, no re-encode)"""
+        if not self.jpegtran_path or photo_path.suffix.lower() not in ('.jpg', '.jpeg'):
+            return False
+        
+        # Only the header is read here; images that need resizing go through Pillow
+        with Image.open(photo_path) as img:
+            if img.format != 'JPEG' or img.width > self.max_width or img.height > self.max_height:
+                return False
+        
+        result = subprocess.run(
+            [self.jpegtran_path, '-copy', 'none', '-optimize', '-progressive',
+             '-outfile', str(temp_path), str(photo_path)],
+            capture_output=True
+        )
+        return result.returncode == 0 and temp_path.exists()
+    
     def optimize_photos_batch(self, sku: str = None) -> Dict[str, Any]:
         """Optimize photos for one item or all items"""
+        _require_pil()
+        
         optimized_count = 0
         saved_bytes = 0
         errors = []
@@ -252,7 +465,7 @@ class PhotoManager:
             items_to_process = [sku]
         else:
             # Optimize photos for all items
-            items_to_process = [d.name for d in self.storage_path.iterdir() if d.is_dir()]
+            items_to_process = [d.name for d in self.iter_item_dirs()]
         
         for item_sku in items_to_process:
             photos_dir = self.get_item_photos_dir(item_sku)
@@ -268,28 +481,31 @@ class PhotoManager:
                         # Re-optimize image
                         temp_path = photo_path.with_suffix('.tmp')
                         
-                        with Image.open(photo_path) as img:
-                            # Remove EXIF and optimize
-                            if img.mode in ('RGBA', 'LA', 'P'):
-                                rgb_img = Image.new('RGB', img.size, (255, 255, 255))
-                                if img.mode == 'P':
-                                    img = img.convert('RGB')
-                                elif img.mode in ('RGBA', 'LA'):
-                                    rgb_img.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                                    img = rgb_img
-                            
-                            save_kwargs = {'optimize': True}
-                            if photo_path.suffix.lower() in ['.jpg', '.jpeg']:
-                                save_kwargs['quality'] = self.jpeg_quality
-                                save_kwargs['format'] = 'JPEG'
-                            
-                            img.save(temp_path, **save_kwargs)
+                        # Lossless path first, full re-encode only when needed
+                        if not self._optimize_jpeg_lossless(photo_path, temp_path):
+                            with Image.open(photo_path) as img:
+                                # Remove EXIF and optimize
+                                if img.mode in ('RGBA', 'LA', 'P'):
+                                    rgb_img = Image.new('RGB', img.size, (255, 255, 255))
+                                    if img.mode == 'P':
+                                        img = img.convert('RGB')
+                                    elif img.mode in ('RGBA', 'LA'):
+                                        rgb_img.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
+                                        img = rgb_img
+                                
+                                save_kwargs = {'optimize': True}
+                                if photo_path.suffix.lower() in ['.jpg', '.jpeg']:
+                                    save_kwargs['quality'] = self.jpeg_quality
+                                    save_kwargs['format'] = 'JPEG'
+                                
+                                img.save(temp_path, **save_kwargs)
                         
                         new_size = temp_path.stat().st_size
                         
                         # Replace original if smaller
                         if new_size < original_size:
                             temp_path.replace(photo_path)
+                            self.store_blob(photo_path)
                             saved_bytes += (original_size - new_size)
                             optimized_count += 1
                         else:
@@ -297,6 +513,8 @@ class PhotoManager:
                             
                     except Exception as e:
                         errors.append(f"{item_sku}/{photo_path.name}: {e}")
+            
+            self.sync_photo_index(item_sku)
         
         return {
             'optimized_count': optimized_count,
@@ -308,6 +526,7 @@ class PhotoManager:
 
 def remove_exif_data(image_path: str, output_path: str = None) -> str:
     """Remove EXIF data from image file"""
+    _require_pil()
     manager = PhotoManager()
     
     source_path = Path(image_path)
@@ -328,7 +547,14 @@ def remove_exif_data(image_path: str, output_path: str = None) -> str:
                 save_kwargs['quality'] = manager.jpeg_quality
                 save_kwargs['format'] = 'JPEG'
             
-            clean_img.save(output_path, **save_kwargs)
+            # output_path may be a stored photo hardlinked to a blob and to
+            # other items' photos, so never write into it directly
+            temp_path = output_path.with_name(f".{output_path.stem}.tmp{output_path.suffix}")
+            try:
+                clean_img.save(temp_path, **save_kwargs)
+                os.replace(temp_path, output_path)
+            finally:
+                temp_path.unlink(missing_ok=True)
         
         return str(output_path)
         
@@ -343,28 +569,50 @@ def get_image_hash(image_path: str) -> str:
     return file_hash
 
 
+def get_file_digest(file_path: str) -> str:
+    """Generate SHA-256 content hash used as the blob store key"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _iter_photo_files(search_dir: str, supported_formats: set):
+    """Yield paths of supported photo files under search_dir"""
+    for root, _, files in os.walk(search_dir):
+        for name in files:
+            if os.path.splitext(name)[1].lower() in supported_formats:
+                yield os.path.join(root, name)
+
+
 def find_duplicate_photos(directory: str = None) -> Dict[str, List[str]]:
     """Find duplicate photos in directory"""
     manager = PhotoManager()
-    search_dir = Path(directory) if directory else manager.storage_path
+    search_dir = directory if directory else str(manager.storage_path)
     
     hash_map = {}
     duplicates = {}
+    seen_inodes = set()
     
-    for photo_path in search_dir.rglob('*'):
-        if photo_path.is_file() and photo_path.suffix.lower() in manager.supported_formats:
-            try:
-                photo_hash = get_image_hash(str(photo_path))
-                
-                if photo_hash in hash_map:
-                    # Duplicate found
-                    if photo_hash not in duplicates:
-                        duplicates[photo_hash] = [hash_map[photo_hash]]
-                    duplicates[photo_hash].append(str(photo_path))
-                else:
-                    hash_map[photo_hash] = str(photo_path)
-                    
-            except Exception:
-                continue  # Skip files that can't be processed
+    for photo_path in _iter_photo_files(search_dir, manager.supported_formats):
+        try:
+            stat = os.stat(photo_path)
+            # Hardlinks to the same blob share storage, they are not duplicates
+            if (stat.st_dev, stat.st_ino) in seen_inodes:
+                continue
+            seen_inodes.add((stat.st_dev, stat.st_ino))
+            
+            photo_hash = get_image_hash(photo_path)
+        except OSError:
+            continue  # Skip files that can't be processed
+        
+        if photo_hash in hash_map:
+            # Duplicate found
+            if photo_hash not in duplicates:
+                duplicates[photo_hash] = [hash_map[photo_hash]]
+            duplicates[photo_hash].append(photo_path)
+        else:
+            hash_map[photo_hash] = photo_path
     
-    return duplicates
\ No newline at end of file
+    return duplicates
@@ -1,36 +1,48 @@
 """Pricing utilities including price rounding and calculations"""
 
-import math
 from decimal import Decimal, ROUND_UP
 from typing import Union
 
 
+_HUNDRED = Decimal('100')
+_CENT = Decimal('0.01')
+
+
+def _to_decimal(value: Union[float, int, Decimal, str]) -> Decimal:
+    """Convert a price-like value to Decimal, skipping the str() round-trip when possible"""
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, int):
+        return Decimal(value)
+    if isinstance(value, float):
+        return Decimal(repr(value))
+    return Decimal(str(value).strip().replace('$', '').replace(',', ''))
+
+
 def round_price_up(price: Union[float, Decimal, str]) -> Decimal:
     """Round price UP to nearest $5 (business rule: always round up)"""
-    price_decimal = Decimal(str(price))
-    
-    # Round up to nearest 5
-    rounded = math.ceil(price_decimal / 5) * 5
+    numerator, denominator = _to_decimal(price).as_integer_ratio()
     
-    return Decimal(str(rounded))
+    # Exact integer ceiling division, avoids Decimal division and quantize
+    return Decimal(-(-numerator // (5 * denominator)) * 5)
 
 
 def calculate_consignment_payout(sale_price: Union[float, Decimal, str], 
                                 platform_fee: Union[float, Decimal, str] = 10,
                                 split_percentage: int = 70) -> Decimal:
     """Calculate consignment payout: split_percentage of (sale_price - platform_fee)"""
-    sale_price_decimal = Decimal(str(sale_price))
-    platform_fee_decimal = Decimal(str(platform_fee))
+    sale_price_decimal = _to_decimal(sale_price)
+    platform_fee_decimal = _to_decimal(platform_fee)
     
     net_amount = sale_price_decimal - platform_fee_decimal
-    payout = net_amount * Decimal(str(split_percentage)) / Decimal('100')
+    payout = net_amount * _to_decimal(split_percentage) / _HUNDRED
     
-    return payout.quantize(Decimal('0.01'), rounding=ROUND_UP)
+    return payout.quantize(_CENT, rounding=ROUND_UP)
 
 
 def format_price(price: Union[float, Decimal, str]) -> str:
     """Format price as currency string"""
-    price_decimal = Decimal(str(price))
+    price_decimal = _to_decimal(price)
     return f"${price_decimal:.2f}"
 
 
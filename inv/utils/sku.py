@@ -1,35 +1,63 @@
 """SKU generation utilities with brand prefix logic"""
 
+import functools
 import re
-from typing import Dict, Optional
+from typing import AbstractSet, Dict, FrozenSet, Optional, Tuple
+from sqlalchemy import Integer, case, cast, func, or_, select
 from sqlalchemy.orm import Session
 
 from ..database.connection import get_db_session
 from ..database.models import Item
-from .config import get_config
+from .config import get_config, get_brand_prefix_index
+
+
+# Common phonetic substitutions used to resolve prefix collisions
+PHONETIC_SUBSTITUTIONS = {
+    'A': ('E', 'I', 'O', 'U'),
+    'E': ('A', 'I', 'O', 'U'),
+    'I': ('A', 'E', 'O', 'U'),
+    'O': ('A', 'E', 'I', 'U'),
+    'U': ('A', 'E', 'I', 'O'),
+    'B': ('P', 'V'),
+    'C': ('K', 'S'),
+    'D': ('T',),
+    'F': ('V', 'P'),
+    'G': ('K', 'J'),
+    'J': ('G', 'Y'),
+    'K': ('C', 'G'),
+    'P': ('B', 'F'),
+    'S': ('C', 'Z'),
+    'T': ('D',),
+    'V': ('B', 'F'),
+    'Y': ('J',),
+    'Z': ('S',),
+}
 
 
 def get_brand_prefix(brand: str) -> str:
     """Get 3-letter prefix for brand, with collision handling"""
-    config = get_config()
-    brand_prefixes = config.get('brand_prefixes', {})
+    brand_prefixes, used_prefixes = get_brand_prefix_index(get_config())
     
     # Normalize brand name
     brand_lower = brand.lower().strip()
     
     # Check if brand already has a prefix
-    if brand_lower in brand_prefixes:
-        return brand_prefixes[brand_lower].upper()
+    prefix = brand_prefixes.get(brand_lower)
+    if prefix is not None:
+        return prefix
     
-    # Generate new prefix from brand name
+    # Generate new prefix, avoiding prefixes already in use
+    return _derive_brand_prefix(brand_lower, used_prefixes)
+
+
+@functools.lru_cache(maxsize=1024)
+def _derive_brand_prefix(brand: str, used_prefixes: FrozenSet[str]) -> str:
+    """Generate a collision-free prefix for a brand (cached per brand and prefix set)"""
     base_prefix = generate_prefix_from_name(brand)
-    
-    # Check for collisions and find available prefix
-    available_prefix = find_available_prefix(base_prefix, brand_prefixes)
-    
-    return available_prefix
+    return _find_available_prefix(base_prefix, used_prefixes)
 
 
+@functools.lru_cache(maxsize=1024)
 def generate_prefix_from_name(brand: str) -> str:
     """Generate 3-letter prefix from brand name"""
     brand = brand.upper().strip()
@@ -56,6 +84,11 @@ def find_available_prefix(base_prefix: str, existing_prefixes: Dict[str, str]) -
     # List of existing prefix values (not keys)
     used_prefixes = set(prefix.upper() for prefix in existing_prefixes.values())
     
+    return _find_available_prefix(base_prefix, used_prefixes)
+
+
+def _find_available_prefix(base_prefix: str, used_prefixes: AbstractSet[str]) -> str:
+    """Find available prefix given the set of prefixes already in use"""
     if base_prefix not in used_prefixes:
         return base_prefix
     
@@ -76,64 +109,55 @@ def find_available_prefix(base_prefix: str, existing_prefixes: Dict[str, str]) -
 
 def generate_phonetic_variants(prefix: str) -> list:
     """Generate phonetic variants for collision resolution"""
+    return list(_phonetic_variants(prefix))
+
+
+@functools.lru_cache(maxsize=1024)
+def _phonetic_variants(prefix: str) -> Tuple[str, ...]:
+    """Cached phonetic variants (the substitution table is static)"""
     if len(prefix) != 3:
-        return []
-    
-    variants = []
-    
-    # Common phonetic substitutions
-    substitutions = {
-        'A': ['E', 'I', 'O', 'U'],
-        'E': ['A', 'I', 'O', 'U'], 
-        'I': ['A', 'E', 'O', 'U'],
-        'O': ['A', 'E', 'I', 'U'],
-        'U': ['A', 'E', 'I', 'O'],
-        'B': ['P', 'V'],
-        'C': ['K', 'S'],
-        'D': ['T'],
-        'F': ['V', 'P'],
-        'G': ['K', 'J'],
-        'J': ['G', 'Y'],
-        'K': ['C', 'G'],
-        'P': ['B', 'F'],
-        'S': ['C', 'Z'],
-        'T': ['D'],
-        'V': ['B', 'F'],
-        'Y': ['J'],
-        'Z': ['S']
-    }
+        return ()
     
     # Generate variants by substituting each position
-    for pos in range(3):
-        original_char = prefix[pos]
-        if original_char in substitutions:
-            for replacement in substitutions[original_char]:
-                variant = prefix[:pos] + replacement + prefix[pos+1:]
-                variants.append(variant)
+    return tuple(
+        prefix[:pos] + replacement + prefix[pos+1:]
+        for pos in range(3)
+        for replacement in PHONETIC_SUBSTITUTIONS.get(prefix[pos], ())
+    )
+
+
+def _three_digits(expr, dialect_name: str):
+    """Filter matching exactly three ASCII digits, in the backend's own syntax"""
+    if dialect_name == 'sqlite':
+        return expr.op('GLOB')('[0-9][0-9][0-9]')
+    # Renders as ~ on PostgreSQL and REGEXP on MySQL
+    return expr.regexp_match('^[0-9]{3}$')
+
+
+def _max_sku_number_query(prefix: str, dialect_name: str):
+    """Build the query for the highest SKU number in use for a prefix"""
+    # Matches PRE001 and variant SKUs like PRE001-2
+    digits = func.substr(Item.sku, len(prefix) + 1, 3)
     
-    return variants
+    return select(func.max(cast(digits, Integer))).where(
+        or_(
+            Item.sku.like(f"{prefix}___"),
+            Item.sku.like(f"{prefix}___-%")
+        ),
+        # LIKE's _ matches any character; CAST would read PRE12A as 12 on
+        # SQLite and raise on PostgreSQL
+        _three_digits(digits, dialect_name)
+    )
 
 
 def get_next_sku_number(prefix: str) -> int:
     """Get the next available SKU number for a given prefix"""
     with get_db_session() as session:
-        # Find highest existing number for this prefix
-        pattern = f"{prefix}%"
-        
-        items = session.query(Item).filter(
-            Item.sku.like(pattern)
-        ).all()
+        # Let the database compute the highest existing number for this prefix
+        query = _max_sku_number_query(prefix, session.get_bind().dialect.name)
+        max_number = session.execute(query).scalar()
         
-        max_number = 0
-        sku_pattern = re.compile(rf'^{re.escape(prefix)}(\d{{3}})(?:-\d+)?$')
-        
-        for item in items:
-            match = sku_pattern.match(item.sku)
-            if match:
-                number = int(match.group(1))
-                max_number = max(max_number, number)
-        
-        return max_number + 1
+        return (max_number or 0) + 1
 
 
 def generate_sku(brand: str, variant_id: int = 1) -> str:
@@ -170,7 +194,8 @@ def extract_variant_id(sku: str) -> int:
 def check_sku_exists(sku: str) -> bool:
     """Check if SKU already exists in database"""
     with get_db_session() as session:
-        return session.query(Item).filter(Item.sku == sku).first() is not None
+        exists_query = session.query(Item.id).filter(Item.sku == sku).exists()
+        return bool(session.query(exists_query).scalar())
 
 
 def find_existing_variants(brand: str, model: str, color: str) -> list:
@@ -188,20 +213,17 @@ def find_existing_variants(brand: str, model: str, color: str) -> list:
 def get_next_variant_id(base_sku: str) -> int:
     """Get next variant ID for a base SKU"""
     with get_db_session() as session:
-        pattern = f"{base_sku}%"
-        
-        items = session.query(Item).filter(
-            Item.sku.like(pattern)
-        ).all()
-        
-        max_variant = 0
-        variant_pattern = re.compile(rf'^{re.escape(base_sku)}(?:-(\d+))?$')
+        # Base SKU counts as variant 1, NIK001-N as variant N
+        variant_id = case(
+            (Item.sku == base_sku, 1),
+            else_=cast(func.substr(Item.sku, len(base_sku) + 2), Integer)
+        )
         
-        for item in items:
-            match = variant_pattern.match(item.sku)
-            if match:
-                variant_str = match.group(1)
-                variant_id = int(variant_str) if variant_str else 1
-                max_variant = max(max_variant, variant_id)
+        max_variant = session.query(func.max(variant_id)).filter(
+            or_(
+                Item.sku == base_sku,
+                Item.sku.like(f"{base_sku}-%")
+            )
+        ).scalar()
         
-        return max_variant + 1
\ No newline at end of file
+        return (max_variant or 0) + 1
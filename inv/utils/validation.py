@@ -25,6 +25,28 @@ VALID_BOX_STATUS = ["box", "tag", "both", "neither"]
 VALID_ITEM_STATUS = ["available", "sold", "held", "deleted"]
 VALID_OWNERSHIP_TYPES = ["owned", "consignment"]
 
+# Hashed copies of the lists above for the validators' membership checks
+_SHOE_SIZES = frozenset(VALID_SHOE_SIZES)
+_CLOTHING_SIZES = frozenset(VALID_CLOTHING_SIZES)
+_CONDITIONS = frozenset(VALID_CONDITIONS)
+_BOX_STATUSES = frozenset(VALID_BOX_STATUS)
+_ITEM_STATUSES = frozenset(VALID_ITEM_STATUS)
+_OWNERSHIP_TYPES = frozenset(VALID_OWNERSHIP_TYPES)
+
+_SHOE_CATEGORIES = frozenset({"shoe", "shoes", "sneaker", "sneakers"})
+_CLOTHING_CATEGORIES = frozenset({"clothing", "apparel", "shirt", "pants", "jacket"})
+
+# Highest price validate_price accepts (compared as Decimal, not float)
+MAX_PRICE = Decimal("999999.99")
+
+_NON_DIGIT_RE = re.compile(r'\D')
+_WHITESPACE_RE = re.compile(r'\s+')
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+# Checked with fullmatch: '$' would also accept a trailing newline, and \d non-ASCII digits
+_SKU_RE = re.compile(r'[A-Z]{3}[0-9]{3}')
+# Canonical format returned by validate_phone, e.g. "(555) 123-4567"
+_PHONE_RE = re.compile(r'\(\d{3}\) \d{3}-\d{4}', re.ASCII)
+
 
 def normalize_size(size_input: str) -> str:
     """Normalize size input to standard format"""
@@ -33,13 +55,18 @@ def normalize_size(size_input: str) -> str:
     
     size = str(size_input).strip().upper()
     
+    # Already normalized ("10", "10.5", "XL"): no fractions or inner spaces to fix.
+    # isascii() because "½" and other non-ASCII digits count as alphanumeric
+    if size.isascii() and size.replace('.', '').isalnum():
+        return size
+    
     # Handle fraction formats
     size = size.replace("½", ".5")
     size = size.replace(" 1/2", ".5")
     size = size.replace("1/2", ".5")
     
     # Remove extra spaces
-    size = re.sub(r'\s+', '', size)
+    size = _WHITESPACE_RE.sub('', size)
     
     return size
 
@@ -48,33 +75,34 @@ def validate_size(size: str, category: str = "shoe") -> bool:
     """Validate if size is in valid list"""
     normalized_size = normalize_size(size)
     
-    if category.lower() in ["shoe", "shoes", "sneaker", "sneakers"]:
-        return normalized_size in VALID_SHOE_SIZES
-    elif category.lower() in ["clothing", "apparel", "shirt", "pants", "jacket"]:
-        return normalized_size in VALID_CLOTHING_SIZES
+    category = category.lower()
+    if category in _SHOE_CATEGORIES:
+        return normalized_size in _SHOE_SIZES
+    elif category in _CLOTHING_CATEGORIES:
+        return normalized_size in _CLOTHING_SIZES
     else:
         # Default to shoe sizes or allow both
-        return normalized_size in VALID_SHOE_SIZES or normalized_size in VALID_CLOTHING_SIZES
+        return normalized_size in _SHOE_SIZES or normalized_size in _CLOTHING_SIZES
 
 
 def validate_condition(condition: str) -> bool:
     """Validate item condition"""
-    return condition in VALID_CONDITIONS
+    return condition in _CONDITIONS
 
 
 def validate_box_status(box_status: str) -> bool:
     """Validate box status"""
-    return box_status in VALID_BOX_STATUS
+    return box_status in _BOX_STATUSES
 
 
 def validate_item_status(status: str) -> bool:
     """Validate item status"""
-    return status in VALID_ITEM_STATUS
+    return status in _ITEM_STATUSES
 
 
 def validate_ownership_type(ownership_type: str) -> bool:
     """Validate ownership type"""
-    return ownership_type in VALID_OWNERSHIP_TYPES
+    return ownership_type in _OWNERSHIP_TYPES
 
 
 def validate_price(price_input: str) -> Decimal:
@@ -86,7 +114,7 @@ def validate_price(price_input: str) -> Decimal:
         price = Decimal(str(price_input).strip().replace('$', '').replace(',', ''))
         if price < 0:
             raise ValueError("Price cannot be negative")
-        if price > 999999.99:
+        if price > MAX_PRICE:
             raise ValueError("Price too large")
         return price
     except InvalidOperation:
@@ -103,8 +131,12 @@ def validate_phone(phone: str) -> str:
     if not phone:
         raise ValueError("Phone number cannot be empty")
     
+    # Already normalized (e.g. read back from the database)
+    if _PHONE_RE.fullmatch(phone):
+        return phone
+    
     # Remove all non-digit characters
-    digits = re.sub(r'\D', '', phone)
+    digits = _NON_DIGIT_RE.sub('', phone)
     
     # Check if it's a valid US phone number
     if len(digits) == 10:
@@ -120,14 +152,12 @@ def validate_email(email: str) -> bool:
     if not email:
         return True  # Email is optional
     
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    return bool(_EMAIL_RE.match(email))
 
 
 def validate_sku_format(sku: str) -> bool:
     """Validate SKU format (3 letters + 3 digits)"""
-    pattern = r'^[A-Z]{3}\d{3}$'
-    return bool(re.match(pattern, sku))
+    return bool(_SKU_RE.fullmatch(sku))
 
 
 def validate_brand_name(brand: str) -> str:
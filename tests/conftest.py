@@ -1,52 +1,154 @@
 """Pytest configuration and fixtures"""
 
-import pytest
-import tempfile
 import os
-from pathlib import Path
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import pytest
+import sqlite3
+import yaml
+from contextlib import contextmanager
+from click.testing import CliRunner
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import configure_mappers, raiseload, sessionmaker
+from sqlalchemy.pool import StaticPool
 
-from inv.database.models import Base
+from inv.cli import cli
+from inv.database.models import Base, Location, Consigner
 from inv.database.connection import DatabaseConnection
-from inv.utils.config import save_config, create_default_config
+from inv.utils.config import save_config, create_default_config, YAML_DUMPER
+
+# Tests pick their config by working directory (or set INV_CONFIG_PATH themselves)
+os.environ.pop("INV_CONFIG_PATH", None)
+
+# Resolve ORM relationships at collection time rather than inside the first test to query
+configure_mappers()
+
+# Import every lazy subcommand module now, so no test pays for the first import
+for _name in cli.list_commands(None):
+    try:
+        cli.get_command(None, _name)
+    except ImportError:
+        pass  # Optional dependency missing; tests of that command skip or fail on their own
+
+
+@event.listens_for(Engine, "connect")
+def _fast_sqlite_pragmas(dbapi_connection, connection_record):
+    """Test databases are throwaway, so skip journaling to disk and fsync on commit"""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+
+# Fixtures that build a database; tests depending on any of them are skipped with --no-db
+DB_FIXTURES = frozenset({
+    'test_engine', 'shared_db_engine', 'memory_db_url', 'mock_db_connection',
+    'temp_config_and_db', 'temp_config_and_db_with_items',
+})
+
+
+def pytest_addoption(parser):
+    parser.addoption("--no-db", action="store_true", default=False,
+                     help="skip tests that need a database (quick unit/CLI wiring runs)")
+
+
+def pytest_report_header(config):
+    """Show which JPEG codec Pillow is linked against (photo test timings depend on it)"""
+    try:
+        import PIL
+        from PIL import features
+    except ImportError:
+        return "Pillow: not installed"
+    turbo = features.version_feature("libjpeg_turbo") if features.check_feature("libjpeg_turbo") else "no"
+    return f"Pillow: {PIL.__version__}, libjpeg: {features.version('jpg')}, libjpeg-turbo: {turbo}"
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip database tests under --no-db, keep serial tests on one xdist worker and start slow tests first"""
+    if config.getoption("--no-db"):
+        skip_db = pytest.mark.skip(reason="database tests disabled by --no-db")
+        for item in items:
+            if DB_FIXTURES.intersection(getattr(item, "fixturenames", ())):
+                item.add_marker(skip_db)
+    
+    # Keep tests marked serial on a single xdist worker (--dist loadgroup)
+    if not config.pluginmanager.hasplugin("xdist"):
+        return
+    for item in items:
+        if item.get_closest_marker("serial"):
+            item.add_marker(pytest.mark.xdist_group("serial"))
+    
+    # Hand the slowest tests out first so no worker is left finishing one at the end.
+    # Only under -n: reordering a serial run would just break up class-scoped fixtures.
+    if config.getoption("numprocesses", None):
+        items.sort(key=lambda item: 0 if item.get_closest_marker("slow") else 1)
+
+
+@pytest.fixture(scope="session")
+def runner():
+    """Click test runner shared by all tests (it keeps no state between invokes)"""
+    return CliRunner()
+
+
+def invoke_cli(args):
+    """Run a CLI command in-process without CliRunner's stream isolation (for setup steps)"""
+    with cli.make_context('inv', list(args)) as ctx:
+        cli.invoke(ctx)
+
+
+@pytest.fixture(scope="session")
+def run_cli():
+    """Return a helper that runs CLI commands whose output the test doesn't check"""
+    return invoke_cli
 
 
 @pytest.fixture
-def temp_config():
+def temp_config(tmp_path, monkeypatch):
     """Create a temporary config file for testing"""
     config = create_default_config()
     config['database']['url'] = 'sqlite:///test.db'
     
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-        import yaml
-        yaml.dump(config, f)
-        config_path = f.name
+    config_path = tmp_path / 'test_config.yaml'
+    with open(config_path, 'w') as f:
+        yaml.dump(config, f, Dumper=YAML_DUMPER)
     
-    # Set config path for tests
-    original_cwd = os.getcwd()
-    test_dir = os.path.dirname(config_path)
-    os.chdir(test_dir)
+    # Run the test from the config's directory
+    monkeypatch.chdir(tmp_path)
     
-    yield config_path
+    yield str(config_path)
+
+
+@pytest.fixture(scope="session")
+def test_engine():
+    """Create the in-memory test engine and schema once per test session"""
+    engine = create_engine(
+        'sqlite:///:memory:',
+        echo=False,
+        connect_args={'check_same_thread': False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
     
-    # Cleanup
-    os.chdir(original_cwd)
-    os.unlink(config_path)
+    yield engine
+    
+    engine.dispose()
 
 
 @pytest.fixture
-def test_db():
-    """Create a test database"""
-    engine = create_engine('sqlite:///:memory:', echo=False)
-    Base.metadata.create_all(engine)
+def test_db(test_engine):
+    """Create a test database whose changes are rolled back after each test"""
+    connection = test_engine.connect()
+    transaction = connection.begin()
     
-    SessionLocal = sessionmaker(bind=engine)
+    # Sessions join the outer transaction; their commits only release savepoints
+    SessionLocal = sessionmaker(bind=connection, join_transaction_mode="create_savepoint")
     
     yield SessionLocal
     
     # Cleanup
-    Base.metadata.drop_all(engine)
+    transaction.rollback()
+    connection.close()
 
 
 @pytest.fixture
@@ -60,19 +162,143 @@ def db_session(test_db):
 
 
 @pytest.fixture
-def mock_db_connection(monkeypatch, test_db):
-    """Mock database connection for testing"""
+def strict_session(db_session):
+    """db_session whose queries raise on any relationship they don't load eagerly"""
+    def add_raiseload(execute_state):
+        if execute_state.is_select and not execute_state.is_relationship_load:
+            execute_state.statement = execute_state.statement.options(raiseload("*"))
+    
+    event.listen(db_session, "do_orm_execute", add_raiseload)
+    yield db_session
+    event.remove(db_session, "do_orm_execute", add_raiseload)
+
+
+@contextmanager
+def count_queries(session, expected):
+    """Assert the block runs exactly `expected` SQL statements on the session's connection"""
+    bind = session.get_bind()
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(bind, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(bind, "before_cursor_execute", record)
+    assert len(statements) == expected, f"expected {expected} queries, ran {len(statements)}:\n" + "\n".join(statements)
+
+
+@pytest.fixture
+def assert_query_count():
+    """Return a context manager that bounds the queries a block may run"""
+    return count_queries
+
+
+@pytest.fixture(scope="module")
+def shared_db_url(request):
+    """Shared-cache in-memory database URL named after the test module"""
+    name = request.module.__name__.rsplit('.', 1)[-1]
+    # Every engine the CLI creates for this URL sees the same data
+    return f'sqlite:///file:{name}?mode=memory&cache=shared&uri=true'
+
+
+@pytest.fixture(scope="module")
+def shared_config_overrides():
+    """Config sections a module wants replaced in its shared config (override per module)"""
+    return {}
+
+
+@pytest.fixture(scope="module")
+def shared_test_dir(tmp_path_factory, shared_db_url, shared_config_overrides):
+    """Create the working directory and config shared by a module's tests"""
+    test_dir = tmp_path_factory.mktemp("shared")
+    
+    config = create_default_config()
+    config['database']['url'] = shared_db_url
+    config.update(shared_config_overrides)
+    save_config(config, path=test_dir / 'config.yaml')
+    
+    return test_dir
+
+
+@pytest.fixture(scope="module")
+def shared_db_engine(shared_db_url):
+    """Create the shared in-memory database schema once per module"""
+    engine = create_engine(shared_db_url)
+    # The in-memory database only lives while a connection to it is open
+    keeper = engine.connect()
+    Base.metadata.create_all(engine)
+    
+    yield engine
+    
+    keeper.close()
+    engine.dispose()
+
+
+def truncate_tables(engine):
+    """Delete all rows from every table, children before parents"""
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+
+
+@pytest.fixture
+def clean_tables():
+    """Return a helper that empties all tables of a shared test database"""
+    return truncate_tables
+
+
+def bulk_seed(engine, locations=(), consigners=()):
+    """Insert seed rows (lists of column dicts) in one transaction, one multi-row INSERT per table"""
+    with engine.begin() as connection:
+        for model, rows in ((Location, locations), (Consigner, consigners)):
+            if rows:
+                connection.execute(insert(model).values(list(rows)))
+
+
+@pytest.fixture
+def seed_rows():
+    """Return a helper that bulk-inserts seed locations and consigners"""
+    return bulk_seed
+
+
+@pytest.fixture
+def reset_db_singleton():
+    """Uninitialized DatabaseConnection singleton, restored to its previous state afterwards"""
+    db_instance = DatabaseConnection()
+    engine, session_factory, engine_key = db_instance._engine, db_instance._session_factory, db_instance._engine_key
+    db_instance._engine = db_instance._session_factory = db_instance._engine_key = None
+    
+    yield db_instance
+    
+    db_instance._engine, db_instance._session_factory, db_instance._engine_key = engine, session_factory, engine_key
+
+
+@pytest.fixture(scope="class")
+def mock_db_connection():
+    """Point the db singleton at one in-memory engine for a whole test class"""
+    # Uses its own engine: setup tests run DDL (drop_all) that must not touch
+    # the shared session-scoped schema
+    engine = create_engine('sqlite://', poolclass=StaticPool, echo=False)
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(bind=engine)
+    
     def mock_get_session():
-        return test_db()
+        return SessionLocal()
     
     def mock_test_connection():
         return True
     
     def mock_get_engine():
-        return test_db().bind
+        return engine
     
-    monkeypatch.setattr('inv.database.connection.db.get_session', mock_get_session)
-    monkeypatch.setattr('inv.database.connection.db.test_connection', mock_test_connection)
-    monkeypatch.setattr('inv.database.connection.db.get_engine', mock_get_engine)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr('inv.database.connection.db.get_session', mock_get_session)
+        mp.setattr('inv.database.connection.db.test_connection', mock_test_connection)
+        mp.setattr('inv.database.connection.db.get_engine', mock_get_engine)
+        
+        yield SessionLocal
     
-    return test_db
\ No newline at end of file
+    engine.dispose()
@@ -1,59 +1,66 @@
 """Test add command functionality"""
 
 import pytest
-import tempfile
-import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
 from decimal import Decimal
-from click.testing import CliRunner
+from sqlalchemy.dialects import postgresql, sqlite
 
 from inv.cli import cli
 from inv.database.models import Item, Location
-from inv.utils.config import save_config, create_default_config
+from inv.utils.config import get_config
+from inv.database.connection import db, get_db_session
+from inv.utils.locations import create_location
+from inv.utils.sku import _max_sku_number_query
 
 
 @pytest.fixture
-def temp_config_and_db():
-    """Create temporary config and database for testing"""
-    # Create temp directory
-    with tempfile.TemporaryDirectory() as temp_dir:
-        original_cwd = os.getcwd()
-        os.chdir(temp_dir)
-        
-        try:
-            # Create test config
-            config = create_default_config()
-            config['database']['url'] = 'sqlite:///test_add.db'
-            save_config(config)
-            
-            # Initialize database
-            from inv.database.connection import db
-            from inv.database.setup import create_tables
-            db.initialize(config)
-            create_tables()
-            
-            # Create test location
-            from inv.utils.locations import create_location
-            create_location('TEST-LOC', 'test', 'Test Location')
-            
-            yield temp_dir
-            
-        finally:
-            os.chdir(original_cwd)
+def temp_config_and_db(shared_test_dir, shared_db_engine, clean_tables, monkeypatch):
+    """Switch into the shared test directory with empty tables and no photos"""
+    monkeypatch.chdir(shared_test_dir)
+    shutil.rmtree(shared_test_dir / 'photos', ignore_errors=True)
+    
+    # Initialize database with empty tables
+    db.initialize(get_config())
+    clean_tables(shared_db_engine)
+    
+    # Create test location
+    create_location('TEST-LOC', 'test', 'Test Location')
+    
+    return shared_test_dir
 
 
 class TestAddCommand:
     """Test the add command functionality"""
     
-    def test_add_command_help(self):
+    def test_add_command_help(self, runner):
         """Test add command help"""
-        runner = CliRunner()
         result = runner.invoke(cli, ['add', '--help'])
         assert result.exit_code == 0
         assert 'Add a new item to inventory' in result.output
     
-    def test_add_basic_item(self, temp_config_and_db):
+    def test_add_help_skips_database_imports(self):
+        """Test add/add-variant help does not import SQLAlchemy"""
+        code = (
+            "import sys\n"
+            "from inv.cli import cli\n"
+            "for args in (['add', '--help'], ['add-variant', '-h']):\n"
+            "    try:\n"
+            "        cli(args, standalone_mode=False)\n"
+            "    except SystemExit:\n"
+            "        pass\n"
+            "print('sqlalchemy' in sys.modules)\n"
+        )
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=Path(__file__).resolve().parent.parent)
+        
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip().endswith('False')
+    
+    def test_add_basic_item(self, temp_config_and_db, runner):
         """Test adding a basic item"""
-        runner = CliRunner()
         result = runner.invoke(cli, [
             'add', 'nike', 'air jordan 1', '10', 'chicago', 'DS', '250', '200', 'box', 'TEST-LOC'
         ])
@@ -65,9 +72,8 @@ class TestAddCommand:
         assert 'Size: 10' in result.output
         assert 'Price: $250.00' in result.output
     
-    def test_add_item_with_notes(self, temp_config_and_db):
+    def test_add_item_with_notes(self, temp_config_and_db, runner):
         """Test adding item with notes"""
-        runner = CliRunner()
         result = runner.invoke(cli, [
             'add', 'adidas', 'yeezy boost 350', '9.5', 'cream', 'VNDS', '180', '150', 'neither', 'TEST-LOC',
             '--notes', 'Small scuff on toe'
@@ -77,9 +83,8 @@ class TestAddCommand:
         assert '✅ Added item ADI001' in result.output
         assert 'Notes: Small scuff on toe' in result.output
     
-    def test_add_consignment_item(self, temp_config_and_db):
+    def test_add_consignment_item(self, temp_config_and_db, runner):
         """Test adding consignment item"""
-        runner = CliRunner()
         result = runner.invoke(cli, [
             'add', 'supreme', 'box logo tee', 'L', 'white', 'DS', '120', '0', 'tag', 'TEST-LOC',
             '--consignment'
@@ -89,9 +94,8 @@ class TestAddCommand:
         assert '✅ Added item SUP001' in result.output
         assert 'Type: Consignment' in result.output
     
-    def test_add_clothing_size(self, temp_config_and_db):
+    def test_add_clothing_size(self, temp_config_and_db, runner):
         """Test adding item with clothing size"""
-        runner = CliRunner()
         result = runner.invoke(cli, [
             'add', 'supreme', 'hoodie', 'XL', 'black', 'Used', '80', '60', 'neither', 'TEST-LOC'
         ])
@@ -100,59 +104,27 @@ class TestAddCommand:
         assert '✅ Added item SUP001' in result.output
         assert 'Size: XL' in result.output
     
-    def test_add_invalid_condition(self, temp_config_and_db):
-        """Test adding item with invalid condition"""
-        runner = CliRunner()
-        result = runner.invoke(cli, [
-            'add', 'nike', 'test shoe', '10', 'black', 'NEW', '100', '80', 'box', 'TEST-LOC'
-        ])
+    @pytest.mark.parametrize("args, expected", [
+        (['nike', 'test shoe', '10', 'black', 'NEW', '100', '80', 'box', 'TEST-LOC'],
+         '❌ Invalid condition'),
+        (['nike', 'test shoe', '10', 'black', 'DS', '100', '80', 'none', 'TEST-LOC'],
+         '❌ Invalid box status'),
+        (['nike', 'test shoe', '99', 'black', 'DS', '100', '80', 'box', 'TEST-LOC'],
+         '❌ Invalid size'),
+        (['nike', 'test shoe', '10', 'black', 'DS', 'abc', '80', 'box', 'TEST-LOC'],
+         '❌ Invalid price format'),
+        (['nike', 'test shoe', '10', 'black', 'DS', '100', '80', 'box', 'INVALID-LOC'],
+         '❌ Location \'INVALID-LOC\' not found'),
+    ], ids=['condition', 'box_status', 'size', 'price', 'location'])
+    def test_add_invalid(self, temp_config_and_db, runner, args, expected):
+        """Test adding item with invalid input"""
+        result = runner.invoke(cli, ['add', *args])
         
         assert result.exit_code == 0
-        assert '❌ Invalid condition' in result.output
+        assert expected in result.output
     
-    def test_add_invalid_box_status(self, temp_config_and_db):
-        """Test adding item with invalid box status"""
-        runner = CliRunner()
-        result = runner.invoke(cli, [
-            'add', 'nike', 'test shoe', '10', 'black', 'DS', '100', '80', 'none', 'TEST-LOC'
-        ])
-        
-        assert result.exit_code == 0
-        assert '❌ Invalid box status' in result.output
-    
-    def test_add_invalid_size(self, temp_config_and_db):
-        """Test adding item with invalid size"""
-        runner = CliRunner()
-        result = runner.invoke(cli, [
-            'add', 'nike', 'test shoe', '99', 'black', 'DS', '100', '80', 'box', 'TEST-LOC'
-        ])
-        
-        assert result.exit_code == 0
-        assert '❌ Invalid size' in result.output
-    
-    def test_add_invalid_price(self, temp_config_and_db):
-        """Test adding item with invalid price"""
-        runner = CliRunner()
-        result = runner.invoke(cli, [
-            'add', 'nike', 'test shoe', '10', 'black', 'DS', 'abc', '80', 'box', 'TEST-LOC'
-        ])
-        
-        assert result.exit_code == 0
-        assert '❌ Invalid price format' in result.output
-    
-    def test_add_invalid_location(self, temp_config_and_db):
-        """Test adding item with invalid location"""
-        runner = CliRunner()
-        result = runner.invoke(cli, [
-            'add', 'nike', 'test shoe', '10', 'black', 'DS', '100', '80', 'box', 'INVALID-LOC'
-        ])
-        
-        assert result.exit_code == 0
-        assert '❌ Location \'INVALID-LOC\' not found' in result.output
-    
-    def test_sku_generation(self, temp_config_and_db):
+    def test_sku_generation(self, temp_config_and_db, runner):
         """Test SKU generation and increment"""
-        runner = CliRunner()
         
         # Add first Nike item
         result1 = runner.invoke(cli, [
@@ -172,9 +144,37 @@ class TestAddCommand:
         ])
         assert '✅ Added item ADI001' in result3.output
     
-    def test_brand_prefix_generation(self, temp_config_and_db):
+    def test_sku_generation_ignores_non_numeric_suffixes(self, temp_config_and_db, runner):
+        """Test hand-entered SKUs with letters after the prefix don't shift numbering"""
+        with get_db_session() as session:
+            location = session.query(Location).filter_by(code='TEST-LOC').one()
+            for sku in ('NIKabc', 'NIK12x', 'NIK9zz-2'):
+                session.add(Item(
+                    sku=sku, brand='nike', model='legacy', size='10', color='black',
+                    condition='DS', box_status='box', current_price=Decimal('100'), purchase_price=Decimal('80'),
+                    location_id=location.id
+                ))
+            session.commit()
+        
+        result = runner.invoke(cli, [
+            'add', 'nike', 'air jordan 1', '10', 'chicago', 'DS', '250', '200', 'box', 'TEST-LOC'
+        ])
+        assert '✅ Added item NIK001' in result.output
+    
+    @pytest.mark.parametrize("dialect, expected", [
+        (sqlite.dialect(), "GLOB '[0-9][0-9][0-9]'"),
+        (postgresql.dialect(), "~ '^[0-9]{3}$'"),
+    ], ids=['sqlite', 'postgresql'])
+    def test_sku_number_query_digit_filter(self, dialect, expected):
+        """Test the next-number query checks for digits in each backend's syntax"""
+        query = _max_sku_number_query('NIK', dialect.name)
+        sql = str(query.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+        
+        assert expected in sql
+        assert sql.count('GLOB') == (dialect.name == 'sqlite')
+    
+    def test_brand_prefix_generation(self, temp_config_and_db, runner):
         """Test brand prefix generation for new brands"""
-        runner = CliRunner()
         
         # Add item from new brand
         result = runner.invoke(cli, [
@@ -185,9 +185,8 @@ class TestAddCommand:
         assert '✅ Added item' in result.output
         # Should generate NEW prefix for newbalance
     
-    def test_photos_directory_creation(self, temp_config_and_db):
+    def test_photos_directory_creation(self, temp_config_and_db, runner):
         """Test that photos directory is created"""
-        runner = CliRunner()
         result = runner.invoke(cli, [
             'add', 'nike', 'test shoe', '10', 'black', 'DS', '100', '80', 'box', 'TEST-LOC'
         ])
@@ -203,16 +202,14 @@ class TestAddCommand:
 class TestAddVariantCommand:
     """Test the add-variant command functionality"""
     
-    def test_add_variant_command_help(self):
+    def test_add_variant_command_help(self, runner):
         """Test add-variant command help"""
-        runner = CliRunner()
         result = runner.invoke(cli, ['add-variant', '--help'])
         assert result.exit_code == 0
         assert 'Add a variant of an existing item' in result.output
     
-    def test_add_variant_nonexistent_item(self, temp_config_and_db):
+    def test_add_variant_nonexistent_item(self, temp_config_and_db, runner):
         """Test adding variant for non-existent item"""
-        runner = CliRunner()
         result = runner.invoke(cli, ['add-variant', 'NIK999'], input='10.5\n')
         
         assert result.exit_code == 0
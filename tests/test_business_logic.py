@@ -1,131 +1,118 @@
 """Test business logic functionality including pricing, fees, and consignment"""
 
 import pytest
-import tempfile
-import os
+import shutil
+import re
 from decimal import Decimal
-from click.testing import CliRunner
 
 from inv.cli import cli
 from inv.database.models import Item, Location, Consigner
-from inv.utils.config import save_config, create_default_config
+from inv.utils.config import get_config
 from inv.utils.pricing import calculate_consignment_payout, round_price_up
+from inv.utils.validation import normalize_size, validate_size, validate_condition
 from inv.utils.consignment import (
     find_or_create_consigner, calculate_consigner_stats, 
     calculate_pending_payouts
 )
+from inv.database.connection import db
+from inv.utils.locations import create_location
+
+
+# "✅ Added item NIK001" / "✅ Added consignment item SUP001: supreme box logo hoodie, ..."
+SKU_RE = re.compile(r"Added (?:consignment )?item ([^\s:]+)")
+
+
+def extract_sku(output: str) -> str:
+    """Extract the SKU reported by the add or intake command"""
+    return SKU_RE.search(output).group(1)
+
+
+@pytest.fixture(scope="module")
+def shared_config_overrides():
+    """Set TEST-LOC as the default location for this module's config"""
+    return {'defaults': {'location': 'TEST-LOC'}}
 
 
 @pytest.fixture
-def temp_config_and_db():
-    """Create temporary config and database for testing"""
-    # Create temp directory
-    with tempfile.TemporaryDirectory() as temp_dir:
-        original_cwd = os.getcwd()
-        os.chdir(temp_dir)
-        
-        try:
-            # Create test config
-            config = create_default_config()
-            config['database']['url'] = 'sqlite:///test_business.db'
-            config['defaults'] = {'location': 'TEST-LOC'}  # Set default location
-            save_config(config)
-            
-            # Initialize database
-            from inv.database.connection import db
-            from inv.database.setup import create_tables
-            db.initialize(config)
-            create_tables()
-            
-            # Create test location
-            from inv.utils.locations import create_location
-            create_location('TEST-LOC', 'test', 'Test Location')
-            
-            yield temp_dir
-            
-        finally:
-            os.chdir(original_cwd)
+def temp_config_and_db(shared_test_dir, shared_db_engine, clean_tables, monkeypatch):
+    """Switch into the shared test directory with empty tables and no photos"""
+    monkeypatch.chdir(shared_test_dir)
+    shutil.rmtree(shared_test_dir / 'photos', ignore_errors=True)
+    
+    # Initialize database with empty tables (schema is built once per module)
+    db.initialize(get_config())
+    clean_tables(shared_db_engine)
+    
+    # Create test location
+    create_location('TEST-LOC', 'test', 'Test Location')
+    
+    return shared_test_dir
 
 
 class TestPricingLogic:
     """Test pricing calculations and business rules"""
     
-    def test_price_rounding_up(self):
+    @pytest.mark.parametrize("price,expected", [
+        ('100.00', '100.00'),
+        ('100.01', '105.00'),
+        ('102.50', '105.00'),
+        ('104.99', '105.00'),
+        ('105.00', '105.00'),
+        ('107.50', '110.00'),
+        ('149.99', '150.00'),
+        ('150.00', '150.00'),
+    ])
+    def test_price_rounding_up(self, price, expected):
         """Test that prices are always rounded UP to nearest $5"""
-        assert round_price_up(Decimal('100.00')) == Decimal('100.00')
-        assert round_price_up(Decimal('100.01')) == Decimal('105.00')
-        assert round_price_up(Decimal('102.50')) == Decimal('105.00')
-        assert round_price_up(Decimal('104.99')) == Decimal('105.00')
-        assert round_price_up(Decimal('105.00')) == Decimal('105.00')
-        assert round_price_up(Decimal('107.50')) == Decimal('110.00')
-        assert round_price_up(Decimal('149.99')) == Decimal('150.00')
-        assert round_price_up(Decimal('150.00')) == Decimal('150.00')
+        assert round_price_up(Decimal(price)) == Decimal(expected)
     
-    def test_price_rounding_edge_cases(self):
+    @pytest.mark.parametrize("price,expected", [
+        ('0.01', '5.00'),
+        ('4.99', '5.00'),
+        ('5.00', '5.00'),
+        ('999.99', '1000.00'),
+        ('1000.00', '1000.00'),
+        ('100.001', '105.00'),
+        (-3, '0.00'),
+        (12.5, '15.00'),
+    ])
+    def test_price_rounding_edge_cases(self, price, expected):
         """Test price rounding edge cases"""
-        assert round_price_up(Decimal('0.01')) == Decimal('5.00')
-        assert round_price_up(Decimal('4.99')) == Decimal('5.00')
-        assert round_price_up(Decimal('5.00')) == Decimal('5.00')
-        assert round_price_up(Decimal('999.99')) == Decimal('1000.00')
-        assert round_price_up(Decimal('1000.00')) == Decimal('1000.00')
+        assert round_price_up(price) == Decimal(expected)
     
-    def test_consignment_payout_calculation(self):
+    @pytest.mark.parametrize("sale_price,platform_fee,split,expected", [
+        # (100 - 10) * 0.70 = 63.00
+        ('100.00', '10.00', 70, '63.00'),
+        # (200 - 15) * 0.60 = 111.00
+        ('200.00', '15.00', 60, '111.00'),
+        # No platform fee: 150 * 0.80 = 120.00
+        ('150.00', '0.00', 80, '120.00'),
+    ], ids=['70-split', '60-split', 'no-fee'])
+    def test_consignment_payout_calculation(self, sale_price, platform_fee, split, expected):
         """Test consignment payout calculations"""
-        # Basic 70/30 split with $10 platform fee
-        payout = calculate_consignment_payout(
-            sale_price=Decimal('100.00'),
-            platform_fee=Decimal('10.00'),
-            split_percentage=70
-        )
-        # (100 - 10) * 0.70 = 90 * 0.70 = 63.00
-        assert payout == Decimal('63.00')
-        
-        # 60/40 split with $15 platform fee
         payout = calculate_consignment_payout(
-            sale_price=Decimal('200.00'),
-            platform_fee=Decimal('15.00'),
-            split_percentage=60
+            sale_price=Decimal(sale_price),
+            platform_fee=Decimal(platform_fee),
+            split_percentage=split
         )
-        # (200 - 15) * 0.60 = 185 * 0.60 = 111.00
-        assert payout == Decimal('111.00')
-        
-        # No platform fee
-        payout = calculate_consignment_payout(
-            sale_price=Decimal('150.00'),
-            platform_fee=Decimal('0.00'),
-            split_percentage=80
-        )
-        # (150 - 0) * 0.80 = 150 * 0.80 = 120.00
-        assert payout == Decimal('120.00')
+        assert payout == Decimal(expected)
     
-    def test_consignment_payout_edge_cases(self):
+    @pytest.mark.parametrize("sale_price,platform_fee,split,expected", [
+        # (100 - 50) * 0.70 = 35.00
+        ('100.00', '50.00', 70, '35.00'),
+        # (100 - 10) * 0.95 = 85.50
+        ('100.00', '10.00', 95, '85.50'),
+        # (100 - 10) * 0.30 = 27.00
+        ('100.00', '10.00', 30, '27.00'),
+    ], ids=['high-fee', 'high-split', 'low-split'])
+    def test_consignment_payout_edge_cases(self, sale_price, platform_fee, split, expected):
         """Test edge cases in payout calculations"""
-        # High platform fee
-        payout = calculate_consignment_payout(
-            sale_price=Decimal('100.00'),
-            platform_fee=Decimal('50.00'),
-            split_percentage=70
-        )
-        # (100 - 50) * 0.70 = 50 * 0.70 = 35.00
-        assert payout == Decimal('35.00')
-        
-        # Very high split percentage
-        payout = calculate_consignment_payout(
-            sale_price=Decimal('100.00'),
-            platform_fee=Decimal('10.00'),
-            split_percentage=95
-        )
-        # (100 - 10) * 0.95 = 90 * 0.95 = 85.50
-        assert payout == Decimal('85.50')
-        
-        # Low split percentage
         payout = calculate_consignment_payout(
-            sale_price=Decimal('100.00'),
-            platform_fee=Decimal('10.00'),
-            split_percentage=30
+            sale_price=Decimal(sale_price),
+            platform_fee=Decimal(platform_fee),
+            split_percentage=split
         )
-        # (100 - 10) * 0.30 = 90 * 0.30 = 27.00
-        assert payout == Decimal('27.00')
+        assert payout == Decimal(expected)
 
 
 class TestConsignmentLogic:
@@ -165,9 +152,8 @@ class TestConsignmentLogic:
         # All should normalize to the same format
         assert consigner1.phone == consigner2.phone == consigner3.phone
     
-    def test_consignment_intake_workflow(self, temp_config_and_db):
+    def test_consignment_intake_workflow(self, temp_config_and_db, runner):
         """Test complete consignment intake workflow"""
-        runner = CliRunner()
         
         # Add consignment item through intake command
         result = runner.invoke(cli, [
@@ -182,25 +168,27 @@ class TestConsignmentLogic:
         assert 'Successfully processed 1 item(s)' in result.output
         assert 'Split: 65% to consigner' in result.output
     
-    def test_consignment_sale_and_payout(self, temp_config_and_db):
+    def test_consignment_sale_and_payout(self, temp_config_and_db, runner):
         """Test selling consignment item and calculating payout"""
-        runner = CliRunner()
         
         # First add a consignment item
         result = runner.invoke(cli, [
             'intake',
             '--consigner', 'Sarah Jones',
             '--phone', '(555) 555-5555',
-            '--split', '70'
-        ], input='supreme\nbox logo hoodie\nL\nblack\nVNDS\n120\ntag\n\n')
+            '--split', '70',
+            '--brand', 'supreme',
+            '--model', 'box logo hoodie',
+            '--size', 'L',
+            '--color', 'black',
+            '--condition', 'VNDS',
+            '--price', '120',
+            '--box-status', 'tag'
+        ])
         
         assert result.exit_code == 0
         
-        # Extract SKU from output
-        lines = result.output.split('\n')
-        sku_line = [line for line in lines if 'Added consignment item' in line][0]
-        # Line format: "✅ Added consignment item SUP001: supreme box logo hoodie, Size L, $120.00"
-        sku = sku_line.split()[4].rstrip(':')  # Extract SKU from position 4
+        sku = extract_sku(result.output)
         
         # Mark item as sold
         result = runner.invoke(cli, [
@@ -215,20 +203,25 @@ class TestConsignmentLogic:
         assert 'Consigner Payout: $84.00' in result.output  # (120 - 0) * 0.70
         assert 'Store Revenue: $36.00' in result.output     # 120 - 84 - 0
     
-    def test_platform_fee_calculations(self, temp_config_and_db):
+    def test_platform_fee_calculations(self, temp_config_and_db, runner):
         """Test different platform fee calculations"""
-        runner = CliRunner()
         
         # Add consignment item
         result = runner.invoke(cli, [
             'intake',
             '--consigner', 'Test Seller',
             '--phone', '(555) 000-0000',
-            '--split', '70'
-        ], input='adidas\nyeezy 350\n9\ncream\nDS\n200\nbox\n\n')
+            '--split', '70',
+            '--brand', 'adidas',
+            '--model', 'yeezy 350',
+            '--size', '9',
+            '--color', 'cream',
+            '--condition', 'DS',
+            '--price', '200',
+            '--box-status', 'box'
+        ])
         
-        sku_line = [line for line in result.output.split('\n') if 'Added consignment item' in line][0]
-        sku = sku_line.split()[4].rstrip(':')
+        sku = extract_sku(result.output)
         
         # Test eBay sale with platform fee
         result = runner.invoke(cli, [
@@ -241,21 +234,22 @@ class TestConsignmentLogic:
         assert 'Platform Fee: $25.00' in result.output  # 200 * 0.125 = 25.00
         assert 'Consigner Payout: $122.50' in result.output  # (200 - 25) * 0.70 = 122.50
     
-    def test_consigner_statistics(self, temp_config_and_db):
+    def test_consigner_statistics(self, temp_config_and_db, runner):
         """Test consigner statistics calculations"""
-        runner = CliRunner()
         
         # Create consigner with multiple items
         consigner = find_or_create_consigner("Stats Test", "(555) 782-8000", default_split=70)
         
-        # Add multiple items through intake
-        for i in range(3):
-            result = runner.invoke(cli, [
-                'intake',
-                '--consigner', 'Stats Test',
-                '--phone', '(555) 782-8000'
-            ], input=f'nike\ntest shoe {i}\n10\nwhite\nDS\n{100 + i*10}\nbox\n\n')
-            assert result.exit_code == 0
+        # Add multiple items in a single batch intake
+        item_input = ''.join(f'nike\ntest shoe {i}\n10\nwhite\nDS\n{100 + i*10}\nbox\n\n' for i in range(3))
+        result = runner.invoke(cli, [
+            'intake',
+            '--consigner', 'Stats Test',
+            '--phone', '(555) 782-8000',
+            '--batch', '3'
+        ], input=item_input)
+        assert result.exit_code == 0
+        assert 'Successfully processed 3 item(s)' in result.output
         
         # Get statistics
         stats = calculate_consigner_stats(consigner.id)
@@ -267,9 +261,8 @@ class TestConsignmentLogic:
         assert stats['total_sold_value'] == Decimal('0')
         assert stats['total_payouts'] == Decimal('0')
     
-    def test_pending_payouts_calculation(self, temp_config_and_db):
+    def test_pending_payouts_calculation(self, temp_config_and_db, runner):
         """Test pending payouts across multiple consigners"""
-        runner = CliRunner()
         
         # Create multiple consigners with sold items
         consigners = [
@@ -285,12 +278,18 @@ class TestConsignmentLogic:
                 'intake',
                 '--consigner', name,
                 '--phone', phone,
-                '--split', str(split)
-            ], input=f'jordan\ntest {i}\n10\nred\nDS\n{sold_prices[i]}\nbox\n\n')
+                '--split', str(split),
+                '--brand', 'jordan',
+                '--model', f'test {i}',
+                '--size', '10',
+                '--color', 'red',
+                '--condition', 'DS',
+                '--price', str(sold_prices[i]),
+                '--box-status', 'box'
+            ])
             
             # Get SKU and mark as sold
-            sku_line = [line for line in result.output.split('\n') if 'Added consignment item' in line][0]
-            sku = sku_line.split()[4].rstrip(':')
+            sku = extract_sku(result.output)
             
             result = runner.invoke(cli, [
                 'consign-sold', sku, str(sold_prices[i]), '--platform', 'store'
@@ -311,9 +310,8 @@ class TestConsignmentLogic:
 class TestBusinessRules:
     """Test specific business rules and edge cases"""
     
-    def test_consignment_vs_owned_items(self, temp_config_and_db):
+    def test_consignment_vs_owned_items(self, temp_config_and_db, runner):
         """Test distinction between consignment and owned items"""
-        runner = CliRunner()
         
         # Add owned item
         result = runner.invoke(cli, [
@@ -330,37 +328,44 @@ class TestBusinessRules:
         assert result.exit_code == 0
         assert 'Added item' in result.output
     
-    def test_size_validation_business_rules(self, temp_config_and_db):
+    def test_size_validation_business_rules(self, temp_config_and_db, runner):
         """Test size validation for different item types"""
-        runner = CliRunner()
-        
-        # Valid shoe sizes
-        for size in ['7', '8.5', '9', '10.5', '11', '12']:
-            result = runner.invoke(cli, [
-                'add', 'nike', 'test shoe', size, 'white', 'DS', '100', '80', 'box', 'TEST-LOC'
-            ])
-            assert result.exit_code == 0
-            assert f'Size: {size}' in result.output
+        shoe_sizes = ['7', '8.5', '9', '10.5', '11', '12']
+        clothing_sizes = ['XS', 'S', 'M', 'L', 'XL', 'XXL']
+        
+        # The sizes the add command accepts, checked without a CLI round-trip each
+        for size in shoe_sizes:
+            assert normalize_size(size) == size
+            assert validate_size(size, "shoe")
+        for size in clothing_sizes:
+            assert normalize_size(size) == size
+            assert validate_size(size, "clothing")
+        
+        # One end-to-end add per item type
+        result = runner.invoke(cli, [
+            'add', 'nike', 'test shoe', shoe_sizes[0], 'white', 'DS', '100', '80', 'box', 'TEST-LOC'
+        ])
+        assert result.exit_code == 0
+        assert f'Size: {shoe_sizes[0]}' in result.output
         
-        # Valid clothing sizes
-        for size in ['XS', 'S', 'M', 'L', 'XL', 'XXL']:
-            result = runner.invoke(cli, [
-                'add', 'supreme', 'test shirt', size, 'white', 'DS', '80', '60', 'tag', 'TEST-LOC'
-            ])
-            assert result.exit_code == 0
-            assert f'Size: {size}' in result.output
+        result = runner.invoke(cli, [
+            'add', 'supreme', 'test shirt', clothing_sizes[0], 'white', 'DS', '80', '60', 'tag', 'TEST-LOC'
+        ])
+        assert result.exit_code == 0
+        assert f'Size: {clothing_sizes[0]}' in result.output
     
-    def test_condition_validation_rules(self, temp_config_and_db):
+    def test_condition_validation_rules(self, temp_config_and_db, runner):
         """Test condition validation business rules"""
-        runner = CliRunner()
         
         # Valid conditions
         for condition in ['DS', 'VNDS', 'Used']:
-            result = runner.invoke(cli, [
-                'add', 'nike', 'test item', '10', 'black', condition, '100', '80', 'box', 'TEST-LOC'
-            ])
-            assert result.exit_code == 0
-            assert f'Condition: {condition}' in result.output
+            assert validate_condition(condition)
+        
+        result = runner.invoke(cli, [
+            'add', 'nike', 'test item', '10', 'black', 'VNDS', '100', '80', 'box', 'TEST-LOC'
+        ])
+        assert result.exit_code == 0
+        assert 'Condition: VNDS' in result.output
         
         # Invalid condition
         result = runner.invoke(cli, [
@@ -369,9 +374,8 @@ class TestBusinessRules:
         assert result.exit_code == 0
         assert '❌ Invalid condition' in result.output
     
-    def test_box_status_validation_rules(self, temp_config_and_db):
+    def test_box_status_validation_rules(self, temp_config_and_db, runner):
         """Test box status validation business rules"""
-        runner = CliRunner()
         
         # Valid box statuses
         for box_status in ['box', 'tag', 'both', 'neither']:
@@ -388,19 +392,24 @@ class TestBusinessRules:
         assert result.exit_code == 0
         assert '❌ Invalid box status' in result.output
     
-    def test_hold_and_release_workflow(self, temp_config_and_db):
+    def test_hold_and_release_workflow(self, temp_config_and_db, runner):
         """Test item hold and release workflow"""
-        runner = CliRunner()
         
         # Add consignment item
         result = runner.invoke(cli, [
             'intake',
             '--consigner', 'Hold Test',
-            '--phone', '(555) 465-3000'
-        ], input='nike\ntest hold\n10\nwhite\nDS\n100\nbox\n\n')
+            '--phone', '(555) 465-3000',
+            '--brand', 'nike',
+            '--model', 'test hold',
+            '--size', '10',
+            '--color', 'white',
+            '--condition', 'DS',
+            '--price', '100',
+            '--box-status', 'box'
+        ])
         
-        sku_line = [line for line in result.output.split('\n') if 'Added consignment item' in line][0]
-        sku = sku_line.split()[4].rstrip(':')
+        sku = extract_sku(result.output)
         
         # Place on hold
         result = runner.invoke(cli, [
@@ -417,9 +426,8 @@ class TestBusinessRules:
         assert result.exit_code == 0
         assert f'Released {sku} from hold' in result.output
     
-    def test_sku_generation_consistency(self, temp_config_and_db):
+    def test_sku_generation_consistency(self, temp_config_and_db, runner):
         """Test SKU generation follows business rules"""
-        runner = CliRunner()
         
         # Test brand prefix consistency
         brands_and_prefixes = [
@@ -447,9 +455,8 @@ class TestBusinessRules:
 class TestIntegrationWorkflows:
     """Test complete business workflows end-to-end"""
     
-    def test_complete_consignment_workflow(self, temp_config_and_db):
+    def test_complete_consignment_workflow(self, temp_config_and_db, runner):
         """Test complete consignment workflow from intake to payout"""
-        runner = CliRunner()
         
         # 1. Intake consignment item
         result = runner.invoke(cli, [
@@ -457,15 +464,22 @@ class TestIntegrationWorkflows:
             '--consigner', 'Complete Test',
             '--phone', '(555) 266-7000',
             '--email', 'complete@test.com',
-            '--split', '70'
-        ], input='jordan\nair jordan 1\n10\nchicago\nDS\n250\nbox\nAuthenticated by StockX\n')
+            '--split', '70',
+            '--brand', 'jordan',
+            '--model', 'air jordan 1',
+            '--size', '10',
+            '--color', 'chicago',
+            '--condition', 'DS',
+            '--price', '250',
+            '--box-status', 'box',
+            '--notes', 'Authenticated by StockX'
+        ])
         
         assert result.exit_code == 0
         assert 'Successfully processed 1 item(s)' in result.output
         
         # Extract SKU
-        sku_line = [line for line in result.output.split('\n') if 'Added consignment item' in line][0]
-        sku = sku_line.split()[4].rstrip(':')
+        sku = extract_sku(result.output)
         
         # 2. List consigners to verify
         result = runner.invoke(cli, ['list-consigners', '--stats'])
@@ -496,9 +510,8 @@ class TestIntegrationWorkflows:
         assert 'Complete Test' in result.output
         assert 'Total Owed:' in result.output
     
-    def test_inventory_management_workflow(self, temp_config_and_db):
+    def test_inventory_management_workflow(self, temp_config_and_db, runner):
         """Test complete inventory management workflow"""
-        runner = CliRunner()
         
         # 1. Add owned inventory
         result = runner.invoke(cli, [
@@ -508,8 +521,7 @@ class TestIntegrationWorkflows:
         assert result.exit_code == 0
         
         # Extract SKU
-        sku_line = [line for line in result.output.split('\n') if 'Added item' in line][0]
-        sku = sku_line.split()[3]  # Position 3 for regular add command
+        sku = extract_sku(result.output)
         
         # 2. Edit item details
         result = runner.invoke(cli, [
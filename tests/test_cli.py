@@ -1,8 +1,6 @@
 """Test CLI commands"""
 
 import pytest
-import tempfile
-import os
 from pathlib import Path
 from click.testing import CliRunner
 
@@ -39,19 +37,11 @@ class TestCLICommands:
         assert result.exit_code == 0
         assert 'Test database connection' in result.output
     
-    def test_test_connection_no_config(self, monkeypatch):
+    def test_test_connection_no_config(self, tmp_path, monkeypatch):
         """Test test-connection without config file"""
-        # Clear config cache
-        monkeypatch.setattr('inv.utils.config._cached_config', None)
+        monkeypatch.chdir(tmp_path)
         
         runner = CliRunner()
-        with tempfile.TemporaryDirectory() as tmp_dir:
-            original_cwd = os.getcwd()
-            os.chdir(tmp_dir)
-            
-            try:
-                result = runner.invoke(test_connection)
-                assert result.exit_code == 1
-                assert 'Configuration file not found' in result.output
-            finally:
-                os.chdir(original_cwd)
\ No newline at end of file
+        result = runner.invoke(test_connection)
+        assert result.exit_code == 1
+        assert 'Configuration file not found' in result.output
\ No newline at end of file
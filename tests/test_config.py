@@ -1,17 +1,22 @@
 """Test configuration management"""
 
 import pytest
-import tempfile
-import os
 from pathlib import Path
-import yaml
 
 from inv.utils.config import (
     load_config, save_config, get_config, validate_config_structure,
-    validate_config_file, create_default_config, get_config_path
+    validate_config_file, create_default_config, get_config_path,
+    get_brand_prefix_index, ConfigLoader, _parse_config, _dump_config
 )
 
 
+@pytest.fixture
+def default_config():
+    """Fresh default config for a test to modify"""
+    # create_default_config builds a new dict each call, which is cheaper than deep-copying a cached template
+    return create_default_config()
+
+
 class TestConfigManagement:
     """Test configuration file management"""
     
@@ -29,91 +34,141 @@ class TestConfigManagement:
         assert config['defaults']['consignment_split'] == 70
         assert config['photos']['storage_path'] == './photos'
     
-    def test_save_and_load_config(self, tmp_path):
-        """Test saving and loading configuration"""
-        # Change to temp directory
-        original_cwd = os.getcwd()
-        os.chdir(tmp_path)
-        
-        try:
-            config = create_default_config()
-            config['database']['url'] = 'sqlite:///test_database.db'
-            
-            # Save config
-            save_config(config)
-            
-            # Load config
-            loaded_config = load_config()
-            
-            assert loaded_config['database']['url'] == 'sqlite:///test_database.db'
-            assert loaded_config['brand_prefixes']['nike'] == 'NIK'
-        finally:
-            os.chdir(original_cwd)
-    
-    def test_load_nonexistent_config(self, tmp_path, monkeypatch):
+    def test_create_default_config_returns_fresh_copy(self):
+        """Test callers can mutate the default config without affecting others"""
+        config = create_default_config()
+        config['database']['url'] = 'sqlite:///other.db'
+        config['brand_prefixes']['newbrand'] = 'NEW'
+        
+        fresh = create_default_config()
+        assert fresh['database']['url'] == 'sqlite:///streetwear_inventory.db'
+        assert 'newbrand' not in fresh['brand_prefixes']
+    
+    def test_save_and_load_config(self):
+        """Test config survives a YAML round-trip"""
+        config = create_default_config()
+        config['database']['url'] = 'sqlite:///test_database.db'
+        
+        loaded_config = _parse_config(_dump_config(config))
+        
+        assert loaded_config == config
+        assert loaded_config['database']['url'] == 'sqlite:///test_database.db'
+        assert loaded_config['brand_prefixes']['nike'] == 'NIK'
+    
+    def test_save_and_load_config_explicit_path(self, tmp_path):
+        """Test saving and loading a config outside the working directory"""
+        config_path = tmp_path / 'other' / 'config.yaml'
+        config_path.parent.mkdir()
+        config = create_default_config()
+        
+        save_config(config, path=config_path)
+        
+        assert load_config(path=config_path) is config
+        assert load_config(path=config_path, force_reload=True) == config
+    
+    def test_config_path_from_environment(self, tmp_path, monkeypatch):
+        """Test INV_CONFIG_PATH overrides config.yaml in the working directory"""
+        config_path = tmp_path / 'elsewhere.yaml'
+        config = create_default_config()
+        save_config(config, path=config_path)
+        monkeypatch.setenv('INV_CONFIG_PATH', str(config_path))
+        
+        assert get_config_path() == config_path
+        assert load_config() is config
+    
+    def test_load_nonexistent_config(self, tmp_path):
         """Test loading non-existent config file"""
-        # Clear cache
-        monkeypatch.setattr('inv.utils.config._cached_config', None)
-        
-        original_cwd = os.getcwd()
-        os.chdir(tmp_path)
-        
-        try:
-            with pytest.raises(FileNotFoundError):
-                load_config()
-        finally:
-            os.chdir(original_cwd)
-    
-    def test_load_invalid_yaml(self, tmp_path, monkeypatch):
-        """Test loading invalid YAML config"""
-        # Clear cache
-        monkeypatch.setattr('inv.utils.config._cached_config', None)
-        
-        original_cwd = os.getcwd()
-        os.chdir(tmp_path)
-        
-        try:
-            # Create invalid YAML file
-            with open('config.yaml', 'w') as f:
-                f.write('invalid: yaml:\n  - content:\n- malformed')
-            
-            with pytest.raises(ValueError, match="Invalid YAML configuration"):
-                load_config()
-        finally:
-            os.chdir(original_cwd)
-    
-    def test_config_caching(self, tmp_path, monkeypatch):
+        loader = ConfigLoader(tmp_path / 'config.yaml')
+        
+        with pytest.raises(FileNotFoundError):
+            loader.load()
+    
+    def test_load_invalid_yaml(self):
+        """Test parsing invalid YAML config"""
+        with pytest.raises(ValueError, match="Invalid YAML configuration"):
+            _parse_config('invalid: yaml:\n  - content:\n- malformed')
+    
+    def test_config_caching(self, tmp_path):
         """Test configuration caching behavior"""
-        # Clear cache
-        monkeypatch.setattr('inv.utils.config._cached_config', None)
-        
-        original_cwd = os.getcwd()
-        os.chdir(tmp_path)
-        
-        try:
-            config = create_default_config()
-            save_config(config)
-            
-            # Load config twice
-            config1 = load_config()
-            config2 = load_config()
-            
-            # Should be same object (cached)
-            assert config1 is config2
-            
-            # Force reload
-            config3 = load_config(force_reload=True)
-            assert config3 is not config1
-        finally:
-            os.chdir(original_cwd)
+        loader = ConfigLoader(tmp_path / 'config.yaml')
+        loader.save(create_default_config())
+        
+        # Load config twice
+        config1 = loader.load()
+        config2 = loader.load()
+        
+        # Should be same object (cached)
+        assert config1 is config2
+        
+        # Force reload
+        config3 = loader.load(force_reload=True)
+        assert config3 is not config1
+        
+        # A fresh loader has its own cache
+        assert ConfigLoader(tmp_path / 'config.yaml').load() is not config1
+
+    
+    def test_config_reload_on_file_change(self, tmp_path, monkeypatch):
+        """Test cached config is re-parsed when the file changes on disk"""
+        monkeypatch.chdir(tmp_path)
+        
+        config = create_default_config()
+        save_config(config)
+        assert load_config() is config
+        
+        # Edit the file behind the cache's back
+        with open('config.yaml', 'a') as f:
+            f.write('extra_section:\n  enabled: true\n')
+        
+        reloaded = load_config()
+        assert reloaded is not config
+        assert reloaded['extra_section']['enabled'] is True
+
+    
+    def test_config_json_sidecar_cache(self, tmp_path, monkeypatch):
+        """Test cold loads write and reuse the JSON sidecar cache"""
+        config_path = tmp_path / 'config.yaml'
+        config = create_default_config()
+        ConfigLoader(config_path).save(config)
+        sidecar = tmp_path / 'config.yaml.cache.json'
+        assert not sidecar.exists()
+        
+        # Cold load parses YAML and writes the sidecar
+        assert ConfigLoader(config_path).load() == config
+        assert sidecar.exists()
+        
+        # Next cold load is served from the sidecar without YAML parsing
+        monkeypatch.setattr('inv.utils.config.yaml.load', None)
+        assert ConfigLoader(config_path).load() == config
+    
+    def test_brand_prefix_index(self):
+        """Test brand prefix lookup is normalized and rebuilt when the mapping changes"""
+        config = create_default_config()
+        config['brand_prefixes']['Off-White'] = 'ofw'
+        
+        lookup, used = get_brand_prefix_index(config)
+        assert lookup['off-white'] == 'OFW'
+        assert 'OFW' in used
+        assert get_brand_prefix_index(config)[0] is lookup
+        
+        config['brand_prefixes'] = {'nike': 'NKE'}
+        lookup, used = get_brand_prefix_index(config)
+        assert lookup == {'nike': 'NKE'}
+        assert used == frozenset({'NKE'})
+        
+        # Edited in place, without save_config
+        config['brand_prefixes']['jordan'] = 'JRD'
+        lookup, used = get_brand_prefix_index(config)
+        assert lookup == {'nike': 'NKE', 'jordan': 'JRD'}
+        assert used == frozenset({'NKE', 'JRD'})
 
 
 class TestConfigValidation:
     """Test configuration validation"""
     
-    def test_validate_valid_config(self):
+    def test_validate_valid_config(self, default_config):
         """Test validation of valid configuration"""
-        config = create_default_config()
+        config = default_config
         config['database']['url'] = 'sqlite:///test_valid.db'
         
         errors = validate_config_structure(config)
@@ -129,61 +184,57 @@ class TestConfigValidation:
         assert any('Missing required section: defaults' in e for e in errors)
         assert any('Missing required section: photos' in e for e in errors)
     
-    def test_validate_invalid_database_config(self):
+    def test_validate_invalid_database_config(self, default_config):
         """Test validation with invalid database config"""
-        config = create_default_config()
+        config = default_config
         config['database'] = 'not a dict'
         
         errors = validate_config_structure(config)
         assert any('database section must be a dictionary' in e for e in errors)
     
-    def test_validate_missing_database_fields(self):
+    def test_validate_missing_database_fields(self, default_config):
         """Test validation with missing database fields"""
-        config = create_default_config()
+        config = default_config
         del config['database']['url']
         
         errors = validate_config_structure(config)
         assert any('Missing database field: url' in e for e in errors)
     
-    def test_validate_empty_database_fields(self):
+    def test_validate_empty_database_fields(self, default_config):
         """Test validation with empty database fields"""
-        config = create_default_config()
+        config = default_config
         config['database']['url'] = ''
         
         errors = validate_config_structure(config)
         assert any('Empty database field: url' in e for e in errors)
     
-    def test_validate_invalid_brand_prefixes(self):
+    def test_validate_invalid_brand_prefixes(self, default_config):
         """Test validation with invalid brand prefixes"""
-        config = create_default_config()
+        config = default_config
         config['brand_prefixes']['nike'] = 'NIKE'  # Too long
         
         errors = validate_config_structure(config)
         assert any("Brand prefix for 'nike' must be exactly 3 characters" in e for e in errors)
     
-    def test_validate_invalid_consignment_split(self):
+    def test_validate_invalid_consignment_split(self, default_config):
         """Test validation with invalid consignment split"""
-        config = create_default_config()
+        config = default_config
         config['defaults']['consignment_split'] = 150  # Too high
         
         errors = validate_config_structure(config)
         assert any('consignment_split must be an integer between 0 and 100' in e for e in errors)
     
-    def test_validate_missing_photos_path(self):
+    def test_validate_missing_photos_path(self, default_config):
         """Test validation with missing photos storage path"""
-        config = create_default_config()
+        config = default_config
         del config['photos']['storage_path']
         
         errors = validate_config_structure(config)
         assert any('Missing photos.storage_path field' in e for e in errors)
     
-    def test_validate_config_file_missing(self, tmp_path):
+    def test_validate_config_file_missing(self, tmp_path, monkeypatch):
         """Test validating non-existent config file"""
-        original_cwd = os.getcwd()
-        os.chdir(tmp_path)
-        
-        try:
-            errors = validate_config_file()
-            assert any('Failed to load config file' in e for e in errors)
-        finally:
-            os.chdir(original_cwd)
\ No newline at end of file
+        monkeypatch.chdir(tmp_path)
+        
+        errors = validate_config_file()
+        assert any('Failed to load config file' in e for e in errors)
\ No newline at end of file
@@ -3,8 +3,12 @@
 import pytest
 from decimal import Decimal
 from datetime import datetime
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.pool import QueuePool, StaticPool
 
-from inv.database.models import Item, Location, Consigner, Photo
+from inv.database.models import Base, Item, Location, Consigner, Photo
 from inv.database.connection import DatabaseConnection, db
 from inv.database.setup import create_tables, drop_tables
 from inv.utils.config import create_default_config
@@ -47,11 +51,7 @@ class TestDatabaseModels:
     
     def test_item_model(self, db_session):
         """Test Item model creation with all fields"""
-        # Create location first
         location = Location(code="TEST-LOC", location_type="test")
-        db_session.add(location)
-        db_session.flush()
-        
         item = Item(
             sku="TST001",
             variant_id=1,
@@ -63,12 +63,12 @@ class TestDatabaseModels:
             box_status="box",
             current_price=Decimal("250.00"),
             purchase_price=Decimal("200.00"),
-            location_id=location.id,
+            location=location,
             notes="Test item",
             status="available",
             ownership_type="owned"
         )
-        db_session.add(item)
+        db_session.add_all([location, item])
         db_session.commit()
         
         assert item.id is not None
@@ -80,11 +80,7 @@ class TestDatabaseModels:
     
     def test_item_with_consignment(self, db_session):
         """Test Item model with consignment fields"""
-        # Create consigner
         consigner = Consigner(name="Jane Doe", phone="(555) 987-6543")
-        db_session.add(consigner)
-        db_session.flush()
-        
         item = Item(
             sku="CON001",
             brand="ConsignBrand",
@@ -96,10 +92,10 @@ class TestDatabaseModels:
             current_price=Decimal("180.00"),
             purchase_price=Decimal("0.00"),
             ownership_type="consignment",
-            consigner_id=consigner.id,
+            consigner=consigner,
             split_percentage=70
         )
-        db_session.add(item)
+        db_session.add_all([consigner, item])
         db_session.commit()
         
         assert item.ownership_type == "consignment"
@@ -119,16 +115,13 @@ class TestDatabaseModels:
             current_price=Decimal("150.00"),
             purchase_price=Decimal("100.00")
         )
-        db_session.add(item)
-        db_session.flush()
-        
         photo = Photo(
-            item_id=item.id,
+            item=item,
             file_path="/photos/PHO001/01_front.jpg",
             photo_type="front",
             display_order=1
         )
-        db_session.add(photo)
+        db_session.add_all([item, photo])
         db_session.commit()
         
         assert photo.id is not None
@@ -136,14 +129,11 @@ class TestDatabaseModels:
         assert photo.file_path == "/photos/PHO001/01_front.jpg"
         assert photo.display_order == 1
     
-    def test_relationships(self, db_session):
+    def test_relationships(self, strict_session, assert_query_count):
         """Test model relationships"""
-        # Create related objects
+        # Link related objects through relationships, no intermediate flushes
         location = Location(code="REL-LOC", location_type="test")
         consigner = Consigner(name="Rel Test", phone="(555) 111-2222")
-        db_session.add_all([location, consigner])
-        db_session.flush()
-        
         item = Item(
             sku="REL001",
             brand="RelBrand",
@@ -154,24 +144,40 @@ class TestDatabaseModels:
             box_status="both",
             current_price=Decimal("300.00"),
             purchase_price=Decimal("250.00"),
-            location_id=location.id,
-            consigner_id=consigner.id
+            location=location,
+            consigner=consigner
         )
-        db_session.add(item)
-        db_session.flush()
-        
-        photo = Photo(item_id=item.id, file_path="/test.jpg")
-        db_session.add(photo)
-        db_session.commit()
+        photo = Photo(item=item, file_path="/test.jpg")
+        strict_session.add_all([location, consigner, item, photo])
+        strict_session.commit()
+        item_id = item.id
         
-        # Test relationships
-        assert item.location == location
-        assert item.consigner == consigner
-        assert len(item.photos) == 1
-        assert item.photos[0] == photo
+        # Reload the whole graph eagerly: one joined SELECT plus one per collection
+        with assert_query_count(strict_session, 4):
+            item = strict_session.execute(
+                select(Item)
+                .options(
+                    joinedload(Item.location).selectinload(Location.items),
+                    joinedload(Item.consigner).selectinload(Consigner.items),
+                    selectinload(Item.photos),
+                )
+                .where(Item.id == item_id)
+            ).unique().scalar_one()
+            
+            # Test relationships
+            assert item.location == location
+            assert item.consigner == consigner
+            assert len(item.photos) == 1
+            assert item.photos[0] == photo
+            
+            assert location.items == [item]
+            assert consigner.items == [item]
         
-        assert location.items == [item]
-        assert consigner.items == [item]
+        # Relationships left out of the query options fail loudly instead of lazy loading
+        strict_session.expunge_all()
+        item = strict_session.execute(select(Item).where(Item.id == item_id)).scalar_one()
+        with pytest.raises(InvalidRequestError):
+            item.photos
 
 
 class TestDatabaseConnection:
@@ -183,7 +189,7 @@ class TestDatabaseConnection:
         db2 = DatabaseConnection()
         assert db1 is db2
     
-    def test_initialize_with_config(self, temp_config):
+    def test_initialize_with_config(self, temp_config, reset_db_singleton):
         """Test database initialization with config"""
         config = create_default_config()
         config['database']['url'] = 'sqlite:///:memory:'
@@ -191,6 +197,58 @@ class TestDatabaseConnection:
         db_instance = DatabaseConnection()
         result = db_instance.initialize(config)
         assert result is True
+        # In-memory databases keep a single shared connection
+        assert isinstance(db_instance.get_engine().pool, StaticPool)
+        assert db_instance.get_engine().pool._pre_ping is False
+    
+    def test_initialize_file_database_pool(self, tmp_path, reset_db_singleton):
+        """Test file databases get a LIFO pool with pre-ping"""
+        config = create_default_config()
+        config['database']['url'] = f"sqlite:///{tmp_path / 'pool.db'}"
+        
+        db_instance = DatabaseConnection()
+        db_instance.initialize(config)
+        pool = db_instance.get_engine().pool
+        assert isinstance(pool, QueuePool)
+        assert pool._pre_ping is True
+        assert pool._pool.use_lifo is True
+    
+    def test_reinitialize_reuses_engine(self, tmp_path, monkeypatch, reset_db_singleton):
+        """Test re-initializing for the same database keeps the engine and its statement cache"""
+        config = create_default_config()
+        config['database']['url'] = 'sqlite:///reuse.db'
+        monkeypatch.chdir(tmp_path)
+        
+        reset_db_singleton.initialize(config)
+        engine = reset_db_singleton.get_engine()
+        reset_db_singleton.initialize(config)
+        assert reset_db_singleton.get_engine() is engine
+        
+        # The same relative URL from another directory is another database
+        (tmp_path / 'other').mkdir()
+        monkeypatch.chdir(tmp_path / 'other')
+        reset_db_singleton.initialize(config)
+        assert reset_db_singleton.get_engine() is not engine
+    
+    def test_reinitialize_private_memory_database(self, reset_db_singleton):
+        """Test a private in-memory database starts empty on every initialize"""
+        config = create_default_config()
+        config['database']['url'] = 'sqlite:///:memory:'
+        
+        reset_db_singleton.initialize(config)
+        engine = reset_db_singleton.get_engine()
+        reset_db_singleton.initialize(config)
+        assert reset_db_singleton.get_engine() is not engine
+    
+    def test_test_engines_skip_fsync(self, tmp_path, reset_db_singleton):
+        """Test file databases opened by the CLI in tests get the conftest PRAGMAs"""
+        config = create_default_config()
+        config['database']['url'] = f"sqlite:///{tmp_path / 'pragmas.db'}"
+        reset_db_singleton.initialize(config)
+        
+        with reset_db_singleton.get_engine().connect() as connection:
+            assert connection.exec_driver_sql("PRAGMA synchronous").scalar() == 0
+            assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == 'memory'
     
     def test_initialize_missing_config(self):
         """Test initialization with missing config values"""
@@ -200,21 +258,15 @@ class TestDatabaseConnection:
         with pytest.raises(ValueError, match="Database URL must be provided"):
             db_instance.initialize(config)
     
-    def test_get_session_without_init(self):
+    def test_get_session_without_init(self, reset_db_singleton):
         """Test getting session without initialization"""
-        db_instance = DatabaseConnection()
-        db_instance._session_factory = None
-        
         with pytest.raises(RuntimeError, match="Database not initialized"):
-            db_instance.get_session()
+            reset_db_singleton.get_session()
     
-    def test_get_engine_without_init(self):
+    def test_get_engine_without_init(self, reset_db_singleton):
         """Test getting engine without initialization"""
-        db_instance = DatabaseConnection()
-        db_instance._engine = None
-        
         with pytest.raises(RuntimeError, match="Database not initialized"):
-            db_instance.get_engine()
+            reset_db_singleton.get_engine()
 
 
 class TestDatabaseSetup:
@@ -225,6 +277,26 @@ class TestDatabaseSetup:
         result = create_tables()
         assert result is True
     
+    def test_create_tables_adds_indexes_to_existing_schema(self, monkeypatch):
+        """Test upgrading a database created before the lookup indexes existed"""
+        engine = create_engine('sqlite://', poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX ix_items_brand_size_condition_price"))
+            conn.execute(text("DROP INDEX ix_items_sku"))
+        monkeypatch.setattr('inv.database.connection.db.get_engine', lambda: engine)
+        
+        assert create_tables() is True
+        assert create_tables() is True
+        
+        # sqlite_master rather than the inspector, which skips expression indexes
+        with engine.connect() as conn:
+            index_names = set(conn.execute(text(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'items'"
+            )).scalars())
+        assert 'ix_items_brand_size_condition_price' in index_names
+        assert 'ix_items_sku' in index_names
+    
     def test_drop_tables(self, mock_db_connection):
         """Test table dropping"""
         result = drop_tables()
@@ -0,0 +1,54 @@
+"""Benchmarks guarding the export commands"""
+
+import json
+import pytest
+from decimal import Decimal
+from sqlalchemy import insert
+
+from inv.cli import cli
+from inv.database.models import Item, Location
+
+pytest.importorskip("pytest_benchmark")
+
+pytestmark = pytest.mark.slow
+
+ITEM_COUNT = 1_000
+
+
+@pytest.fixture(scope="module")
+def seeded_export_dir(shared_test_dir, shared_db_engine):
+    """Shared test directory whose database holds ITEM_COUNT items"""
+    brands = ['nike', 'adidas', 'supreme', 'jordan']
+    with shared_db_engine.begin() as connection:
+        location_id = connection.execute(
+            insert(Location).values(code='TEST-LOC', location_type='test', description='Test Location')
+        ).inserted_primary_key[0]
+        connection.execute(insert(Item), [
+            {
+                'sku': f'TST{i:05d}', 'brand': brands[i % len(brands)], 'model': f'test item {i}',
+                'size': '10', 'color': 'white', 'condition': 'DS', 'box_status': 'box',
+                'current_price': Decimal(100 + i % 100), 'purchase_price': Decimal(80 + i % 100),
+                'location_id': location_id, 'status': 'available', 'ownership_type': 'owned',
+            }
+            for i in range(ITEM_COUNT)
+        ])
+    
+    return shared_test_dir
+
+
+def test_export_inventory_json_perf(benchmark, runner, seeded_export_dir, monkeypatch):
+    """Benchmark a full JSON inventory export streamed to stdout"""
+    monkeypatch.chdir(seeded_export_dir)
+    
+    result = benchmark(runner.invoke, cli, ['export-inventory', 'json', '--output', '-'])
+    assert result.exit_code == 0
+    assert len(json.loads(result.stdout)['data']) == ITEM_COUNT
+
+
+def test_backup_database_perf(benchmark, runner, seeded_export_dir, monkeypatch):
+    """Benchmark a full database backup streamed to stdout"""
+    monkeypatch.chdir(seeded_export_dir)
+    
+    result = benchmark(runner.invoke, cli, ['backup-database', '--output', '-'])
+    assert result.exit_code == 0
+    assert len(json.loads(result.stdout)['items']) == ITEM_COUNT
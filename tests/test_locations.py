@@ -1,83 +1,52 @@
 """Test location command functionality"""
 
 import pytest
-import tempfile
-import os
-from click.testing import CliRunner
 
 from inv.cli import cli
-from inv.utils.config import save_config, create_default_config
+from inv.utils.config import get_config
+from inv.database.connection import db
+from inv.utils.locations import get_location_by_code, validate_location_code, suggest_location_code
+
+
+LIST_ARGV = ('location', '--list')
+STATS_ARGV = ('location', '--stats')
 
 
 @pytest.fixture
-def temp_config_and_db():
-    """Create temporary config and database for testing"""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        original_cwd = os.getcwd()
-        os.chdir(temp_dir)
-        
-        try:
-            # Create test config
-            config = create_default_config()
-            config['database']['url'] = 'sqlite:///test_locations.db'
-            save_config(config)
-            
-            # Initialize database
-            from inv.database.connection import db
-            from inv.database.setup import create_tables
-            db.initialize(config)
-            create_tables()
-            
-            yield temp_dir
-            
-        finally:
-            os.chdir(original_cwd)
+def temp_config_and_db(shared_test_dir, shared_db_engine, clean_tables, monkeypatch):
+    """Switch into the shared test directory with empty tables"""
+    monkeypatch.chdir(shared_test_dir)
+    
+    # Initialize database with empty tables
+    db.initialize(get_config())
+    clean_tables(shared_db_engine)
+    
+    return str(shared_test_dir)
 
 
 @pytest.fixture
-def temp_config_and_db_with_locations():
-    """Create temporary config and database with test locations"""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        original_cwd = os.getcwd()
-        os.chdir(temp_dir)
-        
-        try:
-            # Create test config
-            config = create_default_config()
-            config['database']['url'] = 'sqlite:///test_locations.db'
-            save_config(config)
-            
-            # Initialize database
-            from inv.database.connection import db
-            from inv.database.setup import create_tables
-            db.initialize(config)
-            create_tables()
-            
-            # Create test locations
-            runner = CliRunner()
-            runner.invoke(cli, ['location', '--create', '--code=STORE-A1', '--type=store-floor', '--description=Store Floor Section A1'])
-            runner.invoke(cli, ['location', '--create', '--code=WAREHOUSE-B2', '--type=warehouse', '--description=Warehouse Section B2'])
-            runner.invoke(cli, ['location', '--create', '--code=STORAGE-C3', '--type=storage', '--description=Storage Room C3'])
-            
-            yield temp_dir
-            
-        finally:
-            os.chdir(original_cwd)
+def temp_config_and_db_with_locations(temp_config_and_db, shared_db_engine, seed_rows):
+    """Shared test database with three test locations"""
+    seed_rows(shared_db_engine, locations=[
+        {'code': 'STORE-A1', 'location_type': 'store-floor', 'description': 'Store Floor Section A1'},
+        {'code': 'WAREHOUSE-B2', 'location_type': 'warehouse', 'description': 'Warehouse Section B2'},
+        {'code': 'STORAGE-C3', 'location_type': 'storage', 'description': 'Storage Room C3'},
+    ])
+    
+    return temp_config_and_db
 
 
 class TestLocationCommand:
     """Test the location command functionality"""
     
-    def test_location_command_help(self):
+    def test_location_command_help(self, runner):
         """Test location command help"""
-        runner = CliRunner()
         result = runner.invoke(cli, ['location', '--help'])
         assert result.exit_code == 0
         assert 'Manage inventory locations' in result.output
     
-    def test_create_location(self, temp_config_and_db):
+    def test_create_location(self, runner, temp_config_and_db):
         """Test creating a new location"""
-        runner = CliRunner()
         result = runner.invoke(cli, [
             'location', '--create', '--code=TEST-LOC', '--type=test', '--description=Test Location'
         ])
@@ -86,28 +55,26 @@ class TestLocationCommand:
         assert '✅ Created location: TEST-LOC' in result.output
         assert 'Type: test' in result.output
         assert 'Description: Test Location' in result.output
-    
-    def test_create_location_no_code(self, temp_config_and_db):
-        """Test creating location without code"""
-        runner = CliRunner()
-        result = runner.invoke(cli, ['location', '--create'])
         
-        assert result.exit_code == 0
-        assert '❌ Location code is required' in result.output
+        # Fixtures seed locations directly, so this test covers the CLI write path
+        location = get_location_by_code('TEST-LOC')
+        assert location is not None
+        assert location.location_type == 'test'
+        assert location.is_active is True
     
-    def test_create_location_invalid_code(self, temp_config_and_db):
-        """Test creating location with invalid code"""
-        runner = CliRunner()
-        result = runner.invoke(cli, [
-            'location', '--create', '--code=INVALID CODE!', '--type=test'
-        ])
+    @pytest.mark.parametrize("args,expected", [
+        ([], '❌ Location code is required'),
+        (['--code=INVALID CODE!', '--type=test'], '❌ Invalid location code format'),
+    ], ids=['no-code', 'invalid-code'])
+    def test_create_location_rejected(self, runner, temp_config_and_db, args, expected):
+        """Test creating a location with a missing or invalid code"""
+        result = runner.invoke(cli, ['location', '--create', *args])
         
         assert result.exit_code == 0
-        assert '❌ Invalid location code format' in result.output
+        assert expected in result.output
     
-    def test_create_duplicate_location(self, temp_config_and_db):
+    def test_create_duplicate_location(self, runner, temp_config_and_db):
         """Test creating duplicate location"""
-        runner = CliRunner()
         
         # Create first location
         result1 = runner.invoke(cli, [
@@ -122,18 +89,16 @@ class TestLocationCommand:
         assert result2.exit_code == 0
         assert 'already exists' in result2.output
     
-    def test_list_locations_empty(self, temp_config_and_db):
+    def test_list_locations_empty(self, runner, temp_config_and_db):
         """Test listing locations when none exist"""
-        runner = CliRunner()
-        result = runner.invoke(cli, ['location', '--list'])
+        result = runner.invoke(cli, LIST_ARGV)
         
         assert result.exit_code == 0
         assert 'No locations found' in result.output
     
-    def test_list_locations(self, temp_config_and_db_with_locations):
+    def test_list_locations(self, runner, temp_config_and_db_with_locations):
         """Test listing locations"""
-        runner = CliRunner()
-        result = runner.invoke(cli, ['location', '--list'])
+        result = runner.invoke(cli, LIST_ARGV)
         
         assert result.exit_code == 0
         assert '📍 Locations:' in result.output
@@ -141,10 +106,9 @@ class TestLocationCommand:
         assert 'WAREHOUSE-B2 (warehouse) - Warehouse Section B2 [Active]' in result.output
         assert 'STORAGE-C3 (storage) - Storage Room C3 [Active]' in result.output
     
-    def test_location_stats_empty(self, temp_config_and_db_with_locations):
+    def test_location_stats_empty(self, runner, temp_config_and_db_with_locations):
         """Test location statistics with no items"""
-        runner = CliRunner()
-        result = runner.invoke(cli, ['location', '--stats'])
+        result = runner.invoke(cli, STATS_ARGV)
         
         assert result.exit_code == 0
         assert '📊 Location Statistics:' in result.output
@@ -152,25 +116,22 @@ class TestLocationCommand:
         assert ': 0 items' in result.output
         assert 'Total items: 0' in result.output
     
-    def test_deactivate_location(self, temp_config_and_db_with_locations):
+    def test_deactivate_location(self, runner, temp_config_and_db_with_locations):
         """Test deactivating a location"""
-        runner = CliRunner()
         result = runner.invoke(cli, ['location', '--deactivate=STORAGE-C3'])
         
         assert result.exit_code == 0
         assert '✅ Deactivated location: STORAGE-C3' in result.output
     
-    def test_deactivate_nonexistent_location(self, temp_config_and_db_with_locations):
+    def test_deactivate_nonexistent_location(self, runner, temp_config_and_db_with_locations):
         """Test deactivating non-existent location"""
-        runner = CliRunner()
         result = runner.invoke(cli, ['location', '--deactivate=NONEXISTENT'])
         
         assert result.exit_code == 0
         assert '❌ Location \'NONEXISTENT\' not found' in result.output
     
-    def test_suggest_location_code(self, temp_config_and_db):
+    def test_suggest_location_code(self, runner, temp_config_and_db):
         """Test location code suggestion"""
-        runner = CliRunner()
         result = runner.invoke(cli, ['location', '--suggest'], input='warehouse\nSection D4\nn\n')
         
         assert result.exit_code == 0
@@ -180,16 +141,14 @@ class TestLocationCommand:
 class TestUpdateLocationCommand:
     """Test the update-location command functionality"""
     
-    def test_update_location_command_help(self):
+    def test_update_location_command_help(self, runner):
         """Test update-location command help"""
-        runner = CliRunner()
         result = runner.invoke(cli, ['update-location', '--help'])
         assert result.exit_code == 0
         assert 'Update an existing location' in result.output
     
-    def test_update_location_description(self, temp_config_and_db_with_locations):
+    def test_update_location_description(self, runner, temp_config_and_db_with_locations):
         """Test updating location description"""
-        runner = CliRunner()
         result = runner.invoke(cli, [
             'update-location', 'STORE-A1', '--description=Updated Store Floor Section A1'
         ])
@@ -198,9 +157,8 @@ class TestUpdateLocationCommand:
         assert '✅ Updated location: STORE-A1' in result.output
         assert 'Description: Updated Store Floor Section A1' in result.output
     
-    def test_update_nonexistent_location(self, temp_config_and_db_with_locations):
+    def test_update_nonexistent_location(self, runner, temp_config_and_db_with_locations):
         """Test updating non-existent location"""
-        runner = CliRunner()
         result = runner.invoke(cli, [
             'update-location', 'NONEXISTENT', '--description=Test'
         ])
@@ -208,9 +166,8 @@ class TestUpdateLocationCommand:
         assert result.exit_code == 0
         assert '❌ Location \'NONEXISTENT\' not found' in result.output
     
-    def test_update_location_no_changes(self, temp_config_and_db_with_locations):
+    def test_update_location_no_changes(self, runner, temp_config_and_db_with_locations):
         """Test updating location with no changes specified"""
-        runner = CliRunner()
         result = runner.invoke(cli, ['update-location', 'STORE-A1'])
         
         assert result.exit_code == 0
@@ -220,61 +177,45 @@ class TestUpdateLocationCommand:
 class TestFindLocationCommand:
     """Test the find-location command functionality"""
     
-    def test_find_location_command_help(self):
+    def test_find_location_command_help(self, runner):
         """Test find-location command help"""
-        runner = CliRunner()
         result = runner.invoke(cli, ['find-location', '--help'])
         assert result.exit_code == 0
         assert 'Find locations by code or description' in result.output
     
-    def test_find_location_by_code(self, temp_config_and_db_with_locations):
-        """Test finding location by code"""
-        runner = CliRunner()
-        result = runner.invoke(cli, ['find-location', 'STORE'])
+    @pytest.mark.parametrize("term,expected", [
+        ('STORE', ["🔍 Found 1 location(s) matching 'STORE':", 'STORE-A1']),
+        ('Warehouse', ["🔍 Found 1 location(s) matching 'Warehouse':", 'WAREHOUSE-B2']),
+        ('NONEXISTENT', ["No locations found matching 'NONEXISTENT'"]),
+    ], ids=['by-code', 'by-description', 'no-results'])
+    def test_find_location(self, runner, temp_config_and_db_with_locations, term, expected):
+        """Test finding locations by code or description"""
+        result = runner.invoke(cli, ['find-location', term])
         
         assert result.exit_code == 0
-        assert '🔍 Found 1 location(s) matching \'STORE\':' in result.output
-        assert 'STORE-A1' in result.output
-    
-    def test_find_location_by_description(self, temp_config_and_db_with_locations):
-        """Test finding location by description"""
-        runner = CliRunner()
-        result = runner.invoke(cli, ['find-location', 'Warehouse'])
-        
-        assert result.exit_code == 0
-        assert '🔍 Found 1 location(s) matching \'Warehouse\':' in result.output
-        assert 'WAREHOUSE-B2' in result.output
-    
-    def test_find_location_no_results(self, temp_config_and_db_with_locations):
-        """Test finding location with no results"""
-        runner = CliRunner()
-        result = runner.invoke(cli, ['find-location', 'NONEXISTENT'])
-        
-        assert result.exit_code == 0
-        assert 'No locations found matching \'NONEXISTENT\'' in result.output
+        for text in expected:
+            assert text in result.output
 
 
 class TestLocationUtilities:
     """Test location utility functions"""
     
-    def test_location_code_validation(self):
+    @pytest.mark.parametrize("code,expected", [
+        ('STORE-A1', True),
+        ('WAREHOUSE_B2', True),
+        ('SECTION123', True),
+        ('  STORE-A1  ', True),
+        ('', False),
+        ('INVALID CODE!', False),
+        ('A' * 50, True),
+        ('A' * 51, False),  # Too long
+    ])
+    def test_location_code_validation(self, code, expected):
         """Test location code validation"""
-        from inv.utils.locations import validate_location_code
-        
-        # Valid codes
-        assert validate_location_code('STORE-A1') is True
-        assert validate_location_code('WAREHOUSE_B2') is True
-        assert validate_location_code('SECTION123') is True
-        
-        # Invalid codes
-        assert validate_location_code('') is False
-        assert validate_location_code('INVALID CODE!') is False
-        assert validate_location_code('A' * 51) is False  # Too long
+        assert validate_location_code(code) is expected
     
-    def test_suggest_location_code_function(self):
+    def test_suggest_location_code_function(self, temp_config_and_db):
         """Test location code suggestion function"""
-        from inv.utils.locations import suggest_location_code
-        
         # Test with type only
         suggestion1 = suggest_location_code('warehouse')
         assert 'WARE' in suggestion1
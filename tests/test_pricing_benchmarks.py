@@ -0,0 +1,19 @@
+"""Micro-benchmarks guarding the pricing hot path"""
+
+import pytest
+from decimal import Decimal
+
+from inv.utils.pricing import calculate_consignment_payout, round_price_up
+
+pytest.importorskip("pytest_benchmark")
+
+
+def test_round_price_up_perf(benchmark):
+    """Benchmark rounding a Decimal price up to the nearest $5"""
+    assert benchmark(round_price_up, Decimal('123.45')) == Decimal('125')
+
+
+def test_payout_perf(benchmark):
+    """Benchmark a consignment payout calculation"""
+    payout = benchmark(calculate_consignment_payout, Decimal('250.00'), Decimal('12.50'), 70)
+    assert payout == Decimal('166.25')
@@ -1,181 +1,160 @@
 """Test search command functionality"""
 
+import json
 import pytest
-import tempfile
-import os
-from click.testing import CliRunner
+from decimal import Decimal
+from sqlalchemy import insert
 
 from inv.cli import cli
-from inv.utils.config import save_config, create_default_config
+from inv.commands.search import search_items, count_items
+from inv.database.connection import db, get_db_session
+from inv.database.models import Item, Location
+from inv.utils.config import get_config
+
+
+# (sku, brand, model, size, color, condition, current_price, purchase_price, box_status)
+SEARCH_ITEMS = [
+    # Nike items
+    ('NIK001', 'nike', 'air jordan 1', '10', 'chicago', 'DS', '250', '200', 'box'),
+    ('NIK002', 'nike', 'air jordan 1', '9', 'bred', 'DS', '275', '225', 'box'),
+    ('NIK003', 'nike', 'air force 1', '10', 'white', 'VNDS', '120', '100', 'box'),
+    # Adidas items
+    ('ADI001', 'adidas', 'yeezy boost 350', '9.5', 'cream', 'DS', '180', '150', 'neither'),
+    ('ADI002', 'adidas', 'stan smith', '10', 'white', 'Used', '90', '70', 'box'),
+    # Supreme item
+    ('SUP001', 'supreme', 'box logo tee', 'L', 'white', 'DS', '120', '80', 'tag'),
+]
+
+
+@pytest.fixture(scope="module")
+def seeded_search_dir(shared_test_dir, shared_db_engine):
+    """Shared test directory whose database holds SEARCH_ITEMS (inserted once per module)"""
+    with shared_db_engine.begin() as connection:
+        location_id = connection.execute(
+            insert(Location).values(code='TEST-LOC', location_type='test', description='Test Location')
+        ).inserted_primary_key[0]
+        connection.execute(insert(Item), [
+            {
+                'sku': sku, 'brand': brand, 'model': model, 'size': size, 'color': color,
+                'condition': condition, 'current_price': Decimal(current_price),
+                'purchase_price': Decimal(purchase_price), 'box_status': box_status,
+                'location_id': location_id, 'status': 'available', 'ownership_type': 'owned',
+            }
+            for sku, brand, model, size, color, condition, current_price, purchase_price, box_status
+            in SEARCH_ITEMS
+        ])
+    
+    return shared_test_dir
 
 
 @pytest.fixture
-def temp_config_and_db_with_items():
-    """Create temporary config and database with test items"""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        original_cwd = os.getcwd()
-        os.chdir(temp_dir)
-        
-        try:
-            # Create test config
-            config = create_default_config()
-            config['database']['url'] = 'sqlite:///test_search.db'
-            save_config(config)
-            
-            # Initialize database
-            from inv.database.connection import db
-            from inv.database.setup import create_tables
-            db.initialize(config)
-            create_tables()
-            
-            # Create test location
-            from inv.utils.locations import create_location
-            create_location('TEST-LOC', 'test', 'Test Location')
-            
-            # Add test items
-            runner = CliRunner()
-            
-            # Nike items
-            runner.invoke(cli, ['add', 'nike', 'air jordan 1', '10', 'chicago', 'DS', '250', '200', 'box', 'TEST-LOC'])
-            runner.invoke(cli, ['add', 'nike', 'air jordan 1', '9', 'bred', 'DS', '275', '225', 'box', 'TEST-LOC'])
-            runner.invoke(cli, ['add', 'nike', 'air force 1', '10', 'white', 'VNDS', '120', '100', 'box', 'TEST-LOC'])
-            
-            # Adidas items
-            runner.invoke(cli, ['add', 'adidas', 'yeezy boost 350', '9.5', 'cream', 'DS', '180', '150', 'neither', 'TEST-LOC'])
-            runner.invoke(cli, ['add', 'adidas', 'stan smith', '10', 'white', 'Used', '90', '70', 'box', 'TEST-LOC'])
-            
-            # Supreme item
-            runner.invoke(cli, ['add', 'supreme', 'box logo tee', 'L', 'white', 'DS', '120', '80', 'tag', 'TEST-LOC'])
-            
-            yield temp_dir
-            
-        finally:
-            os.chdir(original_cwd)
+def temp_config_and_db_with_items(seeded_search_dir, monkeypatch):
+    """Point the CLI and database at the seeded search config (the tests here only read the items)"""
+    # Nothing here touches relative paths, so the tests can stay in their own cwd
+    monkeypatch.setenv('INV_CONFIG_PATH', str(seeded_search_dir / 'config.yaml'))
+    db.initialize(get_config())
+    return str(seeded_search_dir)
 
 
 class TestSearchCommand:
     """Test the search command functionality"""
     
-    def test_search_command_help(self):
+    def test_search_command_help(self, runner):
         """Test search command help"""
-        runner = CliRunner()
         result = runner.invoke(cli, ['search', '--help'])
         assert result.exit_code == 0
         assert 'Search inventory items' in result.output
     
-    def test_search_all_items(self, temp_config_and_db_with_items):
+    def test_search_all_items(self, runner, temp_config_and_db_with_items):
         """Test searching all items"""
-        runner = CliRunner()
-        result = runner.invoke(cli, ['search'])
+        result = runner.invoke(cli, ['search', '--json'])
         
         assert result.exit_code == 0
-        assert 'NIK001' in result.output
-        assert 'NIK002' in result.output
-        assert 'NIK003' in result.output
-        assert 'ADI001' in result.output
-        assert 'ADI002' in result.output
-        assert 'SUP001' in result.output
-        assert 'Showing 1-6 of 6 (end)' in result.output
+        data = json.loads(result.output)
+        assert data['total'] == len(SEARCH_ITEMS)
+        assert [item['sku'] for item in data['items']] == sorted(sku for sku, *_ in SEARCH_ITEMS)
     
-    def test_search_by_brand(self, temp_config_and_db_with_items):
-        """Test searching by brand"""
-        runner = CliRunner()
-        result = runner.invoke(cli, ['search', '--brand=nike'])
+    def test_search_table(self, runner, temp_config_and_db_with_items):
+        """Test the default listing shows one line per item and the page footer"""
+        result = runner.invoke(cli, ['search', '--brand=supreme'])
         
         assert result.exit_code == 0
-        assert 'NIK001' in result.output
-        assert 'NIK002' in result.output
-        assert 'NIK003' in result.output
-        assert 'ADI001' not in result.output
-        assert 'SUP001' not in result.output
+        assert 'SUP001 - supreme box logo tee | Size L | $120.00 | TEST-LOC' in result.output
+        assert 'Showing 1-1 of 1 (end)' in result.output
     
-    def test_search_by_text(self, temp_config_and_db_with_items):
-        """Test text search"""
-        runner = CliRunner()
-        result = runner.invoke(cli, ['search', 'jordan'])
+    def test_search_filters_cli(self, runner, temp_config_and_db_with_items):
+        """Test filter options reach the query through the CLI"""
+        result = runner.invoke(cli, ['search', '--brand=nike', '--available', '--min-price=200', '--json'])
         
         assert result.exit_code == 0
-        assert 'NIK001' in result.output  # air jordan 1
-        assert 'NIK002' in result.output  # air jordan 1
-        assert 'NIK003' not in result.output  # air force 1
-        assert 'ADI001' not in result.output
+        # NIK003 is $120
+        assert {item['sku'] for item in json.loads(result.output)['items']} == {'NIK001', 'NIK002'}
     
-    def test_search_by_size(self, temp_config_and_db_with_items):
-        """Test searching by size"""
-        runner = CliRunner()
-        result = runner.invoke(cli, ['search', '--size=10'])
+    @pytest.mark.parametrize('query, filters, expected', [
+        pytest.param(None, {'brand': 'nike'}, {'NIK001', 'NIK002', 'NIK003'}, id='brand'),
+        pytest.param(None, {'brand': 'NIKE'}, {'NIK001', 'NIK002', 'NIK003'}, id='brand_case'),
+        # air jordan 1 matches, air force 1 doesn't
+        pytest.param('jordan', {}, {'NIK001', 'NIK002'}, id='text'),
+        pytest.param(None, {'size': '10'}, {'NIK001', 'NIK003', 'ADI002'}, id='size'),
+        # NIK003 is VNDS, ADI002 is Used
+        pytest.param(None, {'condition': 'DS'}, {'NIK001', 'NIK002', 'ADI001', 'SUP001'}, id='condition'),
+        # All items are available by default
+        pytest.param(None, {'status': 'available'}, {sku for sku, *_ in SEARCH_ITEMS}, id='available'),
+        pytest.param(None, {'status': 'sold'}, set(), id='sold'),
+        # $250 and $275 match; $120 and $180 don't
+        pytest.param(None, {'min_price': 200}, {'NIK001', 'NIK002'}, id='price_range'),
+        pytest.param(None, {'sku': 'NIK001'}, {'NIK001'}, id='sku'),
+        pytest.param(None, {'location': 'test-loc'}, {sku for sku, *_ in SEARCH_ITEMS}, id='location'),
+    ])
+    def test_search_items(self, temp_config_and_db_with_items, query, filters, expected):
+        """Test each search filter returns exactly the matching items"""
+        with get_db_session() as session:
+            results = search_items(session, query, **filters)
         
-        assert result.exit_code == 0
-        assert 'NIK001' in result.output  # size 10
-        assert 'NIK003' in result.output  # size 10
-        assert 'ADI002' in result.output  # size 10
-        assert 'NIK002' not in result.output  # size 9
-        assert 'ADI001' not in result.output  # size 9.5
+        assert {item.sku for item in results} == expected
     
-    def test_search_by_condition(self, temp_config_and_db_with_items):
-        """Test searching by condition"""
-        runner = CliRunner()
-        result = runner.invoke(cli, ['search', '--condition=DS'])
+    def test_count_items(self, temp_config_and_db_with_items, assert_query_count):
+        """Test counting runs one COUNT query instead of loading the items"""
+        with get_db_session() as session:
+            with assert_query_count(session, 1) as statements:
+                total = count_items(session, 'jordan', condition='DS')
         
-        assert result.exit_code == 0
-        assert 'NIK001' in result.output
-        assert 'NIK002' in result.output
-        assert 'ADI001' in result.output
-        assert 'SUP001' in result.output
-        assert 'NIK003' not in result.output  # VNDS
-        assert 'ADI002' not in result.output  # Used
+        assert total == 2
+        assert 'count(' in statements[0].lower()
     
-    def test_search_available_only(self, temp_config_and_db_with_items):
-        """Test searching available items only"""
-        runner = CliRunner()
-        result = runner.invoke(cli, ['search', '--available'])
+    def test_search_uses_composite_index(self, temp_config_and_db_with_items, assert_query_count):
+        """Test brand + size + condition + price searches are answered by the composite index"""
+        with get_db_session() as session:
+            with assert_query_count(session, 1) as statements:
+                search_items(session, brand='nike', size='10', condition='DS', min_price=100)
+            
+            sql = statements[0]
+            plan = session.connection().exec_driver_sql(
+                f'EXPLAIN QUERY PLAN {sql}', (None,) * sql.count('?')
+            ).all()
         
-        assert result.exit_code == 0
-        # All items should be available by default
-        assert 'NIK001' in result.output
-        assert 'ADI001' in result.output
-        assert 'SUP001' in result.output
+        assert any('USING INDEX ix_items_brand_size_condition_price' in row[-1] for row in plan)
     
-    def test_search_by_price_range(self, temp_config_and_db_with_items):
-        """Test searching by price range"""
-        runner = CliRunner()
-        result = runner.invoke(cli, ['search', '--min-price=200'])
-        
-        assert result.exit_code == 0
-        assert 'NIK001' in result.output  # $250
-        assert 'NIK002' in result.output  # $275
-        assert 'NIK003' not in result.output  # $120
-        assert 'ADI001' not in result.output  # $180
-    
-    def test_search_count_only(self, temp_config_and_db_with_items):
+    def test_search_count_only(self, runner, temp_config_and_db_with_items):
         """Test search with count only"""
-        runner = CliRunner()
         result = runner.invoke(cli, ['search', '--count'])
         
         assert result.exit_code == 0
         assert 'Total items: 6' in result.output
         assert 'NIK001' not in result.output  # Should not show details
-    
-    def test_search_by_sku(self, temp_config_and_db_with_items):
-        """Test searching by SKU"""
-        runner = CliRunner()
-        result = runner.invoke(cli, ['search', '--sku=NIK001'])
         
-        assert result.exit_code == 0
-        assert 'NIK001' in result.output
-        assert 'NIK002' not in result.output
+        result = runner.invoke(cli, ['search', '--count', '--json'])
+        assert json.loads(result.output) == {'total': 6}
     
-    def test_search_no_results(self, temp_config_and_db_with_items):
+    def test_search_no_results(self, runner, temp_config_and_db_with_items):
         """Test search with no results"""
-        runner = CliRunner()
         result = runner.invoke(cli, ['search', 'nonexistent'])
         
         assert result.exit_code == 0
         assert 'No items found' in result.output
     
-    def test_search_detailed(self, temp_config_and_db_with_items):
+    def test_search_detailed(self, runner, temp_config_and_db_with_items):
         """Test detailed search results"""
-        runner = CliRunner()
         result = runner.invoke(cli, ['search', '--brand=nike', '--detailed'])
         
         assert result.exit_code == 0
@@ -189,16 +168,14 @@ class TestSearchCommand:
 class TestShowCommand:
     """Test the show command functionality"""
     
-    def test_show_command_help(self):
+    def test_show_command_help(self, runner):
         """Test show command help"""
-        runner = CliRunner()
         result = runner.invoke(cli, ['show', '--help'])
         assert result.exit_code == 0
         assert 'Show detailed information for a specific item' in result.output
     
-    def test_show_existing_item(self, temp_config_and_db_with_items):
+    def test_show_existing_item(self, runner, temp_config_and_db_with_items):
         """Test showing existing item"""
-        runner = CliRunner()
         result = runner.invoke(cli, ['show', 'NIK001'])
         
         assert result.exit_code == 0
@@ -210,9 +187,21 @@ class TestShowCommand:
         assert 'Current Price: $250.00' in result.output
         assert '📸 No photos' in result.output
     
-    def test_show_nonexistent_item(self, temp_config_and_db_with_items):
+    def test_show_json(self, runner, temp_config_and_db_with_items):
+        """Test showing an item as JSON"""
+        result = runner.invoke(cli, ['show', 'NIK001', '--json'])
+        
+        assert result.exit_code == 0
+        data = json.loads(result.output)
+        assert data['sku'] == 'NIK001'
+        assert data['color'] == 'chicago'
+        assert data['current_price'] == '250.00'
+        assert data['purchase_price'] == '200.00'
+        assert data['location'] == 'TEST-LOC'
+        assert data['photos'] == []
+    
+    def test_show_nonexistent_item(self, runner, temp_config_and_db_with_items):
         """Test showing non-existent item"""
-        runner = CliRunner()
         result = runner.invoke(cli, ['show', 'NIK999'])
         
         assert result.exit_code == 0